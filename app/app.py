@@ -1,4 +1,5 @@
 import os, sys
+import importlib.util
 import numpy as np
 import pandas as pd
 from datetime import datetime
@@ -8,22 +9,122 @@ import streamlit as st
 # allow local imports when running from repo root
 sys.path.append(os.path.dirname(__file__))
 
-# Optional: pyCHPP
-try:
-    from pychpp import CHPP
-    PCHPP_AVAILABLE = True
-except Exception:
-    PCHPP_AVAILABLE = False
+# Optional: pyCHPP, imported only once CHPP credentials are entered
+PCHPP_AVAILABLE = importlib.util.find_spec("pychpp") is not None
 
-from ui_helpers import themed_header, kpi_card, badge, parse_player_id_from_url, moneyfmt, df_download_button
-from pricing import predict_price_from_comparables
-from scheduler import recommend_expiry_slots, compute_publish_time
-from features import extract_features_from_player
-from ho_import import parse_ho_csv, parse_ho_paste, ho_specialty_to_index
-from ics_utils import make_ics_single
+from ui_helpers import themed_header, kpi_card, badge, parse_player_id_from_url, moneyfmt, export_download_button
+from pricing_cache import predict_price_cached, predict_prices_cached, comparables_fingerprint, save_default_cache
+from scheduler import recommend_expiry_slots, compute_publish_time, plan_auctions, peak_windows
+from player import Player, PlayerBatch
+from ho_import import parse_ho_csv, parse_ho_paste
+from ics_utils import make_ics
+from batch_pricer import CHUNK_ROWS, OUTPUT_COLUMNS, prediction_row
+from export import FORMATS, ExportWriter, available_formats
+import instrumentation
+import pricing
+from market_store import MarketStore, read_comparables_csv
+from shared_store import default_store, share_frame
+from comps_watch import ComparablesDirectory
+from market_index import MarketPriceIndex
+from peak_slots import PeakSlotHistogram
+
+
+@st.cache_resource
+def _market_store():
+    """Persistent comparables store shared by every session (opt-in)."""
+    path = os.getenv("HT_MARKET_DB")
+    return MarketStore(path) if path else None
+
+
+@st.cache_resource
+def _comps_directory():
+    """Folder of market snapshot CSVs refreshed incrementally (opt-in)."""
+    path = os.getenv("HT_COMPS_DIR")
+    return ComparablesDirectory(path) if path else None
+
+
+_COMPS_SLOTS = 8
+
+
+@st.cache_resource(max_entries=_COMPS_SLOTS)
+def _load_comparables(data: bytes):
+    """Parse an uploaded comparables CSV once and share it read-only.
+
+    Sessions uploading the same file reuse one frame; with HT_SHARED_DIR set,
+    its columns are memory-mapped so every worker on the host shares them.
+    The sales are added to the persistent store once per upload, not on
+    every rerun.
+    """
+    df = read_comparables_csv(data)
+    market_store = _market_store()
+    if market_store is not None:
+        market_store.ingest_frame(df)
+    # Timing hints and the market index are optional; never block pricing on them.
+    for feed in (_peak_slots(), _market_index()):
+        try:
+            feed.add(df)
+        except (ValueError, TypeError):
+            pass
+    store = default_store()
+    if store is not None:
+        df = share_frame(store, df, name=f"comps-{comparables_fingerprint(df)[:16]}")
+        # One slot per cache entry; older uploads would otherwise pile up in tmpfs.
+        store.prune("comps-", keep=_COMPS_SLOTS)
+    return df
+
+
+@st.cache_resource
+def _market_index():
+    """Rolling median price per age band and primary-skill level.
+
+    The bundled sales carry no dates and count as sold this week; the store
+    and uploaded comparables add their sales by deadline.
+    """
+    index = MarketPriceIndex.from_csv()
+    store = _market_store()
+    if store is not None:
+        try:
+            index.add_store(store)
+        except (ValueError, TypeError, pd.errors.DatabaseError):
+            pass
+    return index
+
+
+@st.cache_resource
+def _warm_up_models():
+    """Load the fallback models in the background once per process."""
+    return pricing.warm_up()
+
+
+@st.cache_resource
+def _peak_slots():
+    """Sale premium per weekday/15-minute expiry slot, learned from deadlines.
+
+    Seeded from the bundled sales and the persistent store; uploaded
+    comparables with deadlines are folded in as they are loaded.
+    """
+    peaks = PeakSlotHistogram.from_csv()
+    store = _market_store()
+    if store is not None:
+        try:
+            peaks.add_store(store)
+        except (ValueError, TypeError, pd.errors.DatabaseError):
+            pass  # timing hints are optional; never block pricing on them
+    return peaks
+
+
+def _default_comparables():
+    comps_dir = _comps_directory()
+    if comps_dir is not None:
+        comps_dir.refresh()
+        return comps_dir
+    return _market_store()
+
+PREVIEW_ROWS = 1_000
 
 st.set_page_config(page_title="HT Trader Pro", layout="wide")
 themed_header("📈 HT Trader Pro", "CHPP + HO! • Market analytics, batch import, and auction timing")
+_warm_up_models()
 
 with st.sidebar:
     st.markdown("### 🔐 CHPP Integration")
@@ -41,6 +142,8 @@ with st.sidebar:
 
     chpp = None
     if PCHPP_AVAILABLE and consumer_key and consumer_secret:
+        from pychpp import CHPP
+
         if st.session_state["chpp_tokens"]:
             chpp = CHPP(consumer_key, consumer_secret,
                         st.session_state["chpp_tokens"]["key"],
@@ -75,6 +178,13 @@ with st.sidebar:
                 except Exception as e:
                     st.error(f"Error retrieving tokens: {e}")
 
+if "profile_stats" not in st.session_state:
+    st.session_state["profile_stats"] = instrumentation.Stats()
+instrumentation.use(st.session_state["profile_stats"])
+if "profiling" in st.session_state:
+    # Read the sidebar toggle before anything is priced on this rerun.
+    instrumentation.enable(st.session_state["profiling"])
+
 tab1, tab2, tab3, tab4 = st.tabs(["Link (CHPP)", "HO! CSV", "HO! paste", "Batch + Agenda"])
 
 player_data = None
@@ -87,7 +197,7 @@ with tab1:
     if player_id and chpp:
         try:
             player = chpp.player(int(player_id))
-            player_data = extract_features_from_player(player)
+            player_data = Player.from_chpp(player)
             st.success(f"Loaded via CHPP: {player_data.get('name','(no name)')} (ID {player_id})")
         except Exception as e:
             st.error(f"CHPP error: {e}")
@@ -100,24 +210,8 @@ with tab2:
             ho_df = parse_ho_csv(up.read().decode("utf-8", errors="ignore"))
             if not ho_df.empty:
                 opt = st.selectbox("Select player", options=list(ho_df["Name"]))
-                row = ho_df[ho_df["Name"] == opt].iloc[0].to_dict()
-                player_data = {
-                    "id": None,
-                    "name": row.get("Name","(Player)"),
-                    "age_years": int(row.get("AgeYears",17)),
-                    "age_days": int(row.get("AgeDays",0)),
-                    "playmaking": int(row.get("Playmaking",0)),
-                    "passing": int(row.get("Passing",0)),
-                    "defending": int(row.get("Defending",0)),
-                    "scoring": int(row.get("Scoring",0)),
-                    "winger": int(row.get("Winger",0)),
-                    "stamina": int(row.get("Stamina",0)),
-                    "tsi": int(row.get("TSI",0)),
-                    "form": int(row.get("Form",0)),
-                    "experience": int(row.get("Experience",0)),
-                    "specialty": row.get("Specialty","None"),
-                    "specialty_index": ho_specialty_to_index(row.get("Specialty","None")),
-                }
+                row = ho_df[ho_df["Name"] == opt].iloc[0]
+                player_data = Player.from_ho_row(row)
                 st.success(f"Loaded from HO!: {player_data['name']}")
             else:
                 st.warning("Could not detect standard columns. Check the file.")
@@ -131,23 +225,7 @@ with tab3:
         try:
             row = parse_ho_paste(pasted)
             if row:
-                player_data = {
-                    "id": None,
-                    "name": row.get("Name","(Player)"),
-                    "age_years": int(row.get("AgeYears",17)),
-                    "age_days": int(row.get("AgeDays",0)),
-                    "playmaking": int(row.get("Playmaking",0)),
-                    "passing": int(row.get("Passing",0)),
-                    "defending": int(row.get("Defending",0)),
-                    "scoring": int(row.get("Scoring",0)),
-                    "winger": int(row.get("Winger",0)),
-                    "stamina": int(row.get("Stamina",0)),
-                    "tsi": int(row.get("TSI",0)),
-                    "form": int(row.get("Form",0)),
-                    "experience": int(row.get("Experience",0)),
-                    "specialty": row.get("Specialty","None"),
-                    "specialty_index": ho_specialty_to_index(row.get("Specialty","None")),
-                }
+                player_data = Player.from_paste(row)
                 st.success(f"Loaded from paste: {player_data['name']}")
             else:
                 st.warning("No recognizable data in pasted text.")
@@ -155,60 +233,59 @@ with tab3:
             st.error(f"Parse error: {e}")
 
 with tab4:
-    st.caption("Upload your HO! CSV to estimate **the whole squad** and generate an ICS for the Saturday peak expiry.")
+    st.caption("Upload your HO! CSV to estimate **the whole squad** and plan staggered peak expiries for all of them in one ICS.")
     up_b = st.file_uploader("Upload HO! CSV (batch)", type=["csv"], key="ho_csv_batch")
     comp_b = st.file_uploader("Optional: comparables with prices (CSV)", type=["csv"], key="comps_batch")
     comps = None
     if comp_b is not None:
         try:
-            comps = pd.read_csv(comp_b)
+            comps = _load_comparables(comp_b.getvalue())
         except Exception:
-            try:
-                comps = pd.read_csv(comp_b, sep=";")
-            except Exception:
-                comps = None
+            comps = None
+    comps_source = _default_comparables()
     if up_b is not None:
         ho_df = parse_ho_csv(up_b.read().decode("utf-8", errors="ignore"))
-        rows = []
-        for _, r in ho_df.iterrows():
-            p = {
-                "name": r["Name"],
-                "age_years": int(r["AgeYears"]),
-                "age_days": int(r["AgeDays"]),
-                "playmaking": int(r["Playmaking"]),
-                "passing": int(r["Passing"]),
-                "defending": int(r["Defending"]),
-                "scoring": int(r["Scoring"]),
-                "winger": int(r["Winger"]),
-                "stamina": int(r["Stamina"]),
-                "tsi": int(r["TSI"]),
-                "form": int(r["Form"]),
-                "experience": int(r["Experience"]),
-                "specialty_index": ho_specialty_to_index(r.get("Specialty","None"))
-            }
-            pred = predict_price_from_comparables(p, comps)
-            rows.append({
-                "Name": p["name"],
-                "AgeYears": p["age_years"],
-                "AgeDays": p["age_days"],
-                "Playmaking": p["playmaking"],
-                "PriceExpected": round(pred["price_pred"]),
-                "P25": round(pred["p25"]),
-                "P75": round(pred["p75"]),
-                "Confidence": round(pred["confidence"]*100)
-            })
-        out_df = pd.DataFrame(rows)
-        st.dataframe(out_df, use_container_width=True, height=360)
-        df_download_button(out_df, "predictions.csv", "⬇️ Download predictions CSV")
+        comps_fp = comparables_fingerprint(comps)
+        export_fmt = st.selectbox("Export format", available_formats(), key="batch_export_fmt")
+        # Predictions go straight to a spooled export file; only a preview is kept.
+        writer = ExportWriter(export_fmt, OUTPUT_COLUMNS)
+        preview = []
+        listings = []
+        squad = PlayerBatch.from_ho_frame(ho_df)
+        for start in range(0, len(squad), CHUNK_ROWS):
+            # Cache misses of each chunk share one model call.
+            chunk = squad.take(range(start, min(start + CHUNK_ROWS, len(squad))))
+            preds = predict_prices_cached(chunk, comps, comps_fingerprint=comps_fp, store=comps_source)
+            for p, pred in zip(chunk, preds):
+                row = prediction_row(p, pred)
+                writer.write(row)
+                listings.append({"name": row["Name"], "price": row["PriceExpected"]})
+                if len(preview) < PREVIEW_ROWS:
+                    preview.append(row)
+        save_default_cache()
+        st.dataframe(pd.DataFrame(preview, columns=OUTPUT_COLUMNS), use_container_width=True, height=360)
+        if writer.rows > len(preview):
+            st.caption(f"Showing the first {len(preview)} of {writer.rows} predictions.")
+        export_download_button(writer.finish(), f"predictions{FORMATS[export_fmt][0]}", "⬇️ Download predictions", export_fmt)
 
         tzname = "America/Santiago"
-        sat_exp = recommend_expiry_slots(tzname, (15,45), (15,45))["sat_expiry"]
-        publish_at = compute_publish_time(sat_exp)
-
-        st.markdown(f"**Recommended expiry:** {sat_exp.strftime('%A %d-%m-%Y %H:%M %Z')}  •  **Publish:** {publish_at.strftime('%A %d-%m-%Y %H:%M %Z')}")
-
-        ics_bytes = make_ics_single("Auction expiry (HT)", sat_exp, "Publish 72h before to hit peak", tzname)
-        st.download_button("📅 Download ICS (Saturday expiry)", data=ics_bytes, file_name="saturday_expiry.ics", mime="text/calendar")
+        st.markdown("#### 📅 Selling agenda")
+        per_window = st.number_input("Listings per peak window", min_value=1, max_value=50, value=10, key="agenda_per_window")
+        # Most valuable players get the earliest peak slots.
+        listings.sort(key=lambda item: item["price"], reverse=True)
+        plan = plan_auctions(listings, tzname, peak_windows(_peak_slots(), k=3), per_window=int(per_window))
+        fmt = "%a %d-%m-%Y %H:%M"
+        st.dataframe(pd.DataFrame([
+            {"Name": item["name"], "PriceExpected": item["price"],
+             "Publish": item["publish"].strftime(fmt), "Expires": item["expiry"].strftime(fmt)}
+            for item in plan
+        ]), use_container_width=True, height=240)
+        ics_bytes = make_ics(
+            {"title": f"Auction expiry: {item['name']}", "start": item["expiry"],
+             "description": f"Publish {item['publish'].strftime(fmt)} • expected {moneyfmt(item['price'])}"}
+            for item in plan
+        )
+        st.download_button(f"📅 Download ICS ({len(plan)} auctions)", data=ics_bytes, file_name="selling_agenda.ics", mime="text/calendar")
 
 st.markdown("---")
 st.markdown("### 🔎 Price prediction (single player)")
@@ -216,29 +293,63 @@ uploaded_comps = st.file_uploader("Upload comparables (CSV with prices)", type=[
 comp_df = None
 if uploaded_comps is not None:
     try:
-        comp_df = pd.read_csv(uploaded_comps)
-    except Exception:
-        try:
-            comp_df = pd.read_csv(uploaded_comps, sep=";")
-        except Exception as e:
-            st.error(f"Could not read comparables CSV: {e}")
+        comp_df = _load_comparables(uploaded_comps.getvalue())
+    except Exception as e:
+        st.error(f"Could not read comparables CSV: {e}")
 
 if player_data:
-    pred = predict_price_from_comparables(player_data, comp_df)
+    pred = predict_price_cached(player_data, comp_df, store=_default_comparables())
     c1, c2, c3, c4 = st.columns(4)
     kpi_card(c1, "Expected price", moneyfmt(pred["price_pred"]))
     kpi_card(c2, "50% range (P25–P75)", f"{moneyfmt(pred['p25'])} – {moneyfmt(pred['p75'])}")
     kpi_card(c3, "90% range (P05–P95)", f"{moneyfmt(pred['p05'])} – {moneyfmt(pred['p95'])}")
     kpi_card(c4, "Confidence", f"{int(pred['confidence']*100)}%")
+    market_index = _market_index()
+    market_index.advance_to()
+    trend = market_index.lookup(player_data)
+    if trend:
+        st.caption(
+            f"Market index (same age band and top skill level, last {market_index.window_weeks} weeks): "
+            f"median {moneyfmt(trend['median'])} over {trend['count']} sales"
+        )
 
-    st.markdown("### ⏱ Timing for peak (Saturday 15:45 Chile)")
     tzname = "America/Santiago"
-    sat_exp = recommend_expiry_slots(tzname, (15,45), (15,45))["sat_expiry"]
-    publish_at = compute_publish_time(sat_exp)
+    peaks = _peak_slots()
+    slots = recommend_expiry_slots(tzname, peaks=peaks, player=player_data)
+    best = slots.get("top_windows")
+    if best:
+        st.markdown(f"### ⏱ Timing for peak (learned from {len(peaks)} sale deadlines)")
+        expiry = best[0]["expiry"]
+    else:
+        st.markdown("### ⏱ Timing for peak (Saturday 15:45 Chile)")
+        expiry = slots["sat_expiry"]
+    publish_at = compute_publish_time(expiry)
     c5, c6 = st.columns(2)
-    kpi_card(c5, "Expires (Saturday)", sat_exp.strftime("%A %d-%m-%Y %H:%M %Z"))
+    kpi_card(c5, f"Expires ({expiry.strftime('%A')})", expiry.strftime("%A %d-%m-%Y %H:%M %Z"))
     kpi_card(c6, "Publish at", publish_at.strftime("%A %d-%m-%Y %H:%M %Z"))
+    if best:
+        st.caption("Best windows for this segment: " + " • ".join(
+            f"{w['expiry'].strftime('%a %H:%M')} ({w['premium']:+.1%})" for w in best
+        ))
 else:
     st.info("Load a player (CHPP or HO!) to see the prediction.")
 
 st.caption("HO! for your data; CHPP for live comparables. No scraping.")
+
+with st.sidebar:
+    st.markdown("### ⏱ Profiling")
+    profiling = st.checkbox("Record pipeline timings", value=instrumentation.enabled(), key="profiling")
+    instrumentation.enable(profiling)
+    stats = st.session_state["profile_stats"]
+    snap = stats.snapshot()
+    if snap["stages"]:
+        stage_df = pd.DataFrame.from_dict(snap["stages"], orient="index")
+        st.dataframe(stage_df.round(2), use_container_width=True)
+        if snap["counters"]:
+            st.json(snap["counters"])
+        st.download_button("Stats (JSON)", data=stats.to_json(), file_name="pricing_stats.json", mime="application/json")
+        st.download_button("Stats (Prometheus)", data=stats.to_prometheus(), file_name="pricing_stats.prom", mime="text/plain")
+        if st.button("Reset timings"):
+            stats.reset()
+    elif profiling:
+        st.caption("No timings recorded yet for this session.")
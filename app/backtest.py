@@ -0,0 +1,270 @@
+"""Backtest the pricing paths on historical sales.
+
+Usage::
+
+    python -m app.backtest data/player_sales.csv --splits 5 --workers 4
+    python -m app.backtest sales.csv --mode time --grid '{"weights": {"tsi": [0.5, 1, 2]}}'
+
+Every config is evaluated on every split in a process pool.  For each config
+the report gives MAPE, how often the actual price fell inside the predicted
+p25–p75 and p05–p95 bands, the share of players the path could price and its
+throughput.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# allow local imports when running from repo root
+sys.path.append(os.path.dirname(__file__))
+
+import pricing  # noqa: E402
+import pricing_model  # noqa: E402
+from market_store import read_comparables_csv  # noqa: E402
+
+PATHS = ("comparables", "model", "combined")
+TIME_COLUMNS = ("deadline", "sale_date", "date")
+
+REPORT_COLUMNS = ["config", "path", "folds", "players", "priced", "mape", "cover_50", "cover_90", "players_per_s"]
+
+_SALES: pd.DataFrame | None = None
+_SPLITS: list[tuple[np.ndarray, np.ndarray]] = []
+
+
+def kfold_splits(n: int, k: int = 5, *, seed: int = 0) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Shuffled ``(train, test)`` row positions for ``k`` folds."""
+
+    if not 2 <= k <= n:
+        raise ValueError(f"k must be between 2 and the number of sales ({n})")
+    order = np.random.default_rng(seed).permutation(n)
+    folds = np.array_split(order, k)
+    return [(np.sort(np.concatenate(folds[:i] + folds[i + 1:])), np.sort(test)) for i, test in enumerate(folds)]
+
+
+def time_splits(sales: pd.DataFrame, k: int = 5, *, time_col: str | None = None) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Expanding-window splits: each fold is tested on sales after its training data."""
+
+    if time_col is None:
+        time_col = next((c for c in TIME_COLUMNS if c in sales.columns), None)
+    if time_col is None or time_col not in sales.columns:
+        raise ValueError(f"time-ordered splits need one of the columns {', '.join(TIME_COLUMNS)}")
+    order = np.argsort(pd.to_datetime(sales[time_col]).to_numpy(), kind="stable")
+    blocks = np.array_split(order, k + 1)
+    if min(len(b) for b in blocks) == 0:
+        raise ValueError(f"not enough sales for {k} time-ordered splits")
+    return [(np.sort(np.concatenate(blocks[:i + 1])), np.sort(blocks[i + 1])) for i in range(k)]
+
+
+def default_configs() -> list[dict]:
+    """The current comparables settings, the tree on its own and both combined."""
+
+    return [{"name": "baseline", "path": path} for path in PATHS]
+
+
+def grid_configs(weights_grid: dict | None = None, scales_grid: dict | None = None, *, path: str = "comparables") -> list[dict]:
+    """One config per combination of the candidate weight and scale values.
+
+    Grids map attribute names to lists of values, which override the
+    defaults for that attribute.
+    """
+
+    axes = [("weights", attr, values) for attr, values in (weights_grid or {}).items()]
+    axes += [("scales", attr, values) for attr, values in (scales_grid or {}).items()]
+    configs = []
+    for combo in itertools.product(*[values for _, _, values in axes]):
+        config = {"name": "", "path": path, "weights": {}, "scales": {}}
+        for (kind, attr, _), value in zip(axes, combo):
+            config[kind][attr] = float(value)
+        config["name"] = " ".join(f"{kind[0]}.{attr}={value:g}" for (kind, attr, _), value in zip(axes, combo)) or "baseline"
+        configs.append(config)
+    return configs
+
+
+def _init_worker(sales, splits):
+    global _SALES, _SPLITS
+    _SALES = sales
+    _SPLITS = splits
+
+
+def _overrides(player: dict, config: dict, kind: str) -> dict | None:
+    values = config.get(kind)
+    if not values:
+        return None
+    if kind == "weights":
+        base = pricing.GOALKEEPER_WEIGHTS if pricing._is_goalkeeper(player) else pricing.DEFAULT_WEIGHTS
+    else:
+        base = pricing.GOALKEEPER_SCALES if pricing._is_goalkeeper(player) else pricing.DEFAULT_SCALES
+    return {**base, **values}
+
+
+def _model_prices(train: pd.DataFrame, test: pd.DataFrame) -> np.ndarray:
+    is_gk = (test["goalkeeping"] >= 7).to_numpy() if "goalkeeping" in test.columns else np.zeros(len(test), bool)
+    prices = np.empty(len(test))
+    for goalkeeper in (False, True):
+        mask = is_gk == goalkeeper
+        if not mask.any():
+            continue
+        features = pricing_model.FEATURES_GK if goalkeeper else pricing_model.FEATURES
+        model = pricing_model.fit_model(train, goalkeeper=goalkeeper)
+        prices[mask] = model.predict(test.loc[mask, :].reindex(columns=features, fill_value=0))
+    return prices
+
+
+def _run_fold(task: tuple[int, dict]) -> dict:
+    """Price the test rows of one split with one config."""
+
+    fold, config = task
+    train_idx, test_idx = _SPLITS[fold]
+    train = _SALES.iloc[train_idx].reset_index(drop=True)
+    test = _SALES.iloc[test_idx].reset_index(drop=True)
+    players = test.to_dict("records")
+    path = config.get("path", "combined")
+    min_comps = config.get("min_comps", 3)
+
+    started = time.perf_counter()
+    estimates: list[dict | None] = [None] * len(players)
+    if path in ("comparables", "combined"):
+        for i, player in enumerate(players):
+            estimates[i] = pricing._estimate_from_market(
+                player,
+                train,
+                min_comps=min_comps,
+                weights=_overrides(player, config, "weights"),
+                scales=_overrides(player, config, "scales"),
+                store=None,
+                market_index=None,
+            )
+    if path in ("model", "combined"):
+        missing = [i for i, est in enumerate(estimates) if est is None]
+        if missing:
+            prices = _model_prices(train, test.iloc[missing])
+            for i, price in zip(missing, prices):
+                estimates[i] = pricing._model_estimate(players[i], float(price))
+    elapsed = time.perf_counter() - started
+
+    priced = [(est, player["price"]) for est, player in zip(estimates, players) if est is not None]
+    pred = np.array([est["price_pred"] for est, _ in priced], dtype=float)
+    actual = np.array([price for _, price in priced], dtype=float)
+    bands = {q: np.array([est[q] for est, _ in priced], dtype=float) for q in ("p05", "p25", "p75", "p95")}
+    return {
+        "config": config["name"],
+        "path": path,
+        "fold": fold,
+        "players": len(players),
+        "priced": len(priced),
+        "abs_pct_error": float(np.sum(np.abs(pred - actual) / actual)),
+        "in_50": int(np.sum((actual >= bands["p25"]) & (actual <= bands["p75"]))),
+        "in_90": int(np.sum((actual >= bands["p05"]) & (actual <= bands["p95"]))),
+        "seconds": elapsed,
+    }
+
+
+def _summarize(results: list[dict]) -> pd.DataFrame:
+    rows = []
+    for (name, path), group in itertools.groupby(results, key=lambda r: (r["config"], r["path"])):
+        group = list(group)
+        players = sum(r["players"] for r in group)
+        priced = sum(r["priced"] for r in group)
+        seconds = sum(r["seconds"] for r in group)
+        rows.append({
+            "config": name,
+            "path": path,
+            "folds": len(group),
+            "players": players,
+            "priced": priced,
+            "mape": sum(r["abs_pct_error"] for r in group) / priced if priced else float("nan"),
+            "cover_50": sum(r["in_50"] for r in group) / priced if priced else float("nan"),
+            "cover_90": sum(r["in_90"] for r in group) / priced if priced else float("nan"),
+            "players_per_s": players / seconds if seconds else float("inf"),
+        })
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def run_backtest(
+    sales: pd.DataFrame,
+    configs: list[dict] | None = None,
+    *,
+    mode: str = "kfold",
+    splits: int = 5,
+    seed: int = 0,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """Evaluate ``configs`` on ``splits`` folds of ``sales``, one row per config.
+
+    ``mode`` is ``"kfold"`` for shuffled folds or ``"time"`` for
+    expanding-window splits ordered by the sale deadline.
+    """
+
+    sales = sales.reset_index(drop=True)
+    if mode == "time":
+        fold_idx = time_splits(sales, splits)
+    elif mode == "kfold":
+        fold_idx = kfold_splits(len(sales), splits, seed=seed)
+    else:
+        raise ValueError(f"unknown backtest mode {mode!r}")
+    configs = configs if configs is not None else default_configs()
+    for config in configs:
+        if config.get("path", "combined") not in PATHS:
+            raise ValueError(f"unknown pricing path {config['path']!r}")
+    tasks = [(fold, config) for config in configs for fold in range(len(fold_idx))]
+
+    if workers <= 1:
+        _init_worker(sales, fold_idx)
+        results = list(map(_run_fold, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sales, fold_idx)) as pool:
+            results = list(pool.map(_run_fold, tasks))
+    return _summarize(results)
+
+
+def grid_search(
+    sales: pd.DataFrame,
+    weights_grid: dict | None = None,
+    scales_grid: dict | None = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Backtest every weight/scale combination, best MAPE first."""
+
+    report = run_backtest(sales, grid_configs(weights_grid, scales_grid), **kwargs)
+    return report.sort_values("mape", kind="stable").reset_index(drop=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="backtest", description="Backtest pricing paths on historical sales.")
+    parser.add_argument("sales", help="sales CSV with prices")
+    parser.add_argument("--mode", choices=["kfold", "time"], default="kfold")
+    parser.add_argument("--splits", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0, help="shuffle seed for k-fold splits")
+    parser.add_argument("--workers", type=int, default=1, help="number of backtest processes (default: 1)")
+    parser.add_argument("--grid", help='JSON {"weights": {attr: [values]}, "scales": {attr: [values]}}')
+    parser.add_argument("-o", "--output", help="also write the report to this CSV file")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        sales = read_comparables_csv(args.sales)
+        if args.grid:
+            grid = json.loads(args.grid)
+            report = grid_search(sales, grid.get("weights"), grid.get("scales"), mode=args.mode,
+                                 splits=args.splits, seed=args.seed, workers=args.workers)
+        else:
+            report = run_backtest(sales, mode=args.mode, splits=args.splits, seed=args.seed, workers=args.workers)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    if args.output:
+        report.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Price a whole HO! squad export from the command line.
+
+Usage::
+
+    python -m app.batch_pricer squad.csv --comps comps.csv -o predictions.csv
+    cat squad.csv | python -m app.batch_pricer - --format jsonl --workers 4
+    python -m app.batch_pricer squad.csv -o predictions.csv.gz   # or .parquet
+
+Predictions are written as soon as they are produced, in CSV, gzipped CSV,
+JSON lines or Parquet (with ``pyarrow``) depending on the output extension.  Exit codes: ``0`` on
+success, ``1`` when some players could not be priced, ``2`` for usage errors
+and ``3`` when the input files cannot be read.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# allow local imports when running from repo root
+sys.path.append(os.path.dirname(__file__))
+
+from export import FORMATS, ExportWriter, available_formats, format_for_path  # noqa: E402
+from ho_import import parse_ho_csv  # noqa: E402
+from market_store import read_comparables_csv  # noqa: E402
+from player import PlayerBatch  # noqa: E402
+from pricing import predict_price_from_comparables, predict_prices  # noqa: E402
+from shared_store import SharedArrayStore, attach_frame, default_store, share_frame  # noqa: E402
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_INPUT = 3
+
+OUTPUT_COLUMNS = ["Name", "AgeYears", "AgeDays", "Playmaking", "PriceExpected", "P25", "P75", "Confidence"]
+
+CHUNK_ROWS = 256
+
+_COMPS = None
+_MIN_COMPS = 3
+
+
+def prediction_row(p, pred: dict) -> dict:
+    """Output row shared by the CLI and the Streamlit batch tab."""
+    return {
+        "Name": p["name"],
+        "AgeYears": p["age_years"],
+        "AgeDays": p["age_days"],
+        "Playmaking": p["playmaking"],
+        "PriceExpected": round(pred["price_pred"]),
+        "P25": round(pred["p25"]),
+        "P75": round(pred["p75"]),
+        "Confidence": round(pred["confidence"] * 100),
+    }
+
+
+def _init_worker(comps, min_comps, shared=None):
+    """Set the pool worker's comparables, attaching ``shared=(dir, name)`` if given."""
+    global _COMPS, _MIN_COMPS
+    if shared is not None:
+        comps = attach_frame(SharedArrayStore(shared[0]), shared[1])
+    _COMPS = comps
+    _MIN_COMPS = min_comps
+
+
+def _price(p):
+    try:
+        pred = predict_price_from_comparables(p, _COMPS, min_comps=_MIN_COMPS)
+        return prediction_row(p, pred), None
+    except Exception as e:
+        return None, f"{p.get('name')}: {e}"
+
+
+def _price_chunk(chunk: PlayerBatch) -> list[tuple[dict | None, str | None]]:
+    """Price a chunk with one model call; re-price one by one if it fails."""
+    try:
+        preds = predict_prices(chunk, _COMPS, min_comps=_MIN_COMPS)
+    except Exception:
+        return [_price(p) for p in chunk]
+    return [(prediction_row(p, pred), None) for p, pred in zip(chunk, preds)]
+
+
+def _chunks(players: PlayerBatch, chunk_rows: int):
+    for start in range(0, len(players), chunk_rows):
+        yield players.take(range(start, min(start + chunk_rows, len(players))))
+
+
+def iter_predictions(players, comps=None, *, min_comps: int = 3, workers: int = 1, chunk_rows: int = CHUNK_ROWS):
+    """Yield ``(row, error)`` pairs in input order as they are priced.
+
+    Players are priced ``chunk_rows`` at a time through
+    :func:`pricing.predict_prices`, so output still streams chunk by chunk.
+    """
+
+    if not isinstance(players, PlayerBatch):
+        players = PlayerBatch.from_players(players)
+    if workers > 1:
+        # Give every worker at least one chunk on small squads.
+        chunk_rows = max(1, min(chunk_rows, -(-len(players) // workers)))
+    chunks = _chunks(players, chunk_rows)
+    if workers <= 1:
+        _init_worker(comps, min_comps)
+        for results in map(_price_chunk, chunks):
+            yield from results
+        return
+    # With HT_SHARED_DIR set, workers map one published copy of the
+    # comparables instead of each unpickling their own.
+    store = default_store() if comps is not None else None
+    if store is not None:
+        name = f"batch-comps-{os.getpid()}"
+        share_frame(store, comps, name=name)
+        initargs = (None, min_comps, (str(store.directory), name))
+    else:
+        initargs = (comps, min_comps)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            for results in pool.map(_price_chunk, chunks):
+                yield from results
+    finally:
+        if store is not None:
+            store.remove(name)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="batch_pricer", description="Price every player of an HO! CSV export.")
+    parser.add_argument("squad", help="HO! CSV export, or '-' to read stdin")
+    parser.add_argument("--comps", help="comparables CSV with prices")
+    parser.add_argument("-o", "--output", default="-", help="output file, or '-' for stdout (default)")
+    parser.add_argument("--format", choices=list(FORMATS), help="output format (default: from extension, else csv)")
+    parser.add_argument("--workers", type=int, default=1, help="number of pricing processes (default: 1)")
+    parser.add_argument("--min-comps", type=int, default=3, help="minimum comparables before the model fallback")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.workers < 1:
+        print("error: --workers must be at least 1", file=sys.stderr)
+        return EXIT_USAGE
+    fmt = args.format or format_for_path(args.output)
+    if fmt not in available_formats():
+        print(f"error: {fmt} output needs the optional 'pyarrow' package", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        if args.squad == "-":
+            text = sys.stdin.read()
+        else:
+            with open(args.squad, encoding="utf-8", errors="ignore") as f:
+                text = f.read()
+        squad = parse_ho_csv(text)
+        comps = read_comparables_csv(args.comps) if args.comps else None
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_INPUT
+    if squad.empty:
+        print("error: no players found in squad file", file=sys.stderr)
+        return EXIT_INPUT
+
+    players = PlayerBatch.from_ho_frame(squad)
+    to_stdout = args.output == "-"
+    try:
+        out = sys.stdout.buffer if to_stdout else open(args.output, "wb")
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    writer = ExportWriter(fmt, OUTPUT_COLUMNS, out)
+    failures = 0
+    try:
+        for row, error in iter_predictions(players, comps, min_comps=args.min_comps, workers=args.workers):
+            if error is not None:
+                failures += 1
+                print(f"warning: {error}", file=sys.stderr)
+                continue
+            writer.write(row)
+            if to_stdout:
+                writer.flush()
+        writer.finish()
+    finally:
+        if not to_stdout:
+            out.close()
+    return EXIT_PARTIAL if failures else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
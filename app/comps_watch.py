@@ -0,0 +1,158 @@
+import hashlib
+import math
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import pricing
+from market_store import _sorted_quantile, read_comparables_csv
+
+
+@dataclass
+class _FileState:
+    mtime_ns: int
+    size: int
+    digest: str
+    file_id: int
+
+
+def _remove_sorted(sorted_values: np.ndarray, removed: np.ndarray) -> np.ndarray:
+    """Delete ``removed`` (a multiset of present values) from a sorted array."""
+
+    if removed.size == 0:
+        return sorted_values
+    values, counts = np.unique(removed, return_counts=True)
+    starts = np.searchsorted(sorted_values, values, side="left")
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.delete(sorted_values, np.repeat(starts, counts) + offsets)
+
+
+class ComparablesDirectory:
+    """Comparables pool fed by the CSV snapshots dropped into a folder.
+
+    :meth:`refresh` only reads files whose modification time or size changed
+    and only re-ingests them when their content hash differs.  Each file is
+    kept as its own chunk, so adding or dropping one touches only that chunk
+    plus one merge into the sorted price array behind the outlier limits.
+    The combined :attr:`frame` is built on first use after a change, and
+    :meth:`candidates` selects rows from it with a mask instead of copying
+    the pool for every player.
+
+    The object can be passed as ``store`` to
+    :func:`pricing.predict_price_from_comparables`.
+    """
+
+    def __init__(self, directory: Path | str, pattern: str = "*.csv"):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self._chunks: dict[int, pd.DataFrame] = {}
+        self._frame: pd.DataFrame | None = None
+        self._files: dict[str, _FileState] = {}
+        self._prices = np.empty(0, dtype=float)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks.values())
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """All comparables currently in the folder."""
+
+        frame = self._frame
+        if frame is None:
+            with self._lock:
+                if self._frame is None:
+                    chunks = [self._chunks[i] for i in sorted(self._chunks)]
+                    self._frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+                frame = self._frame
+        return frame
+
+    def refresh(self) -> dict[str, list[str]]:
+        """Ingest new or changed files and drop removed ones."""
+
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> dict[str, list[str]]:
+        report: dict[str, list[str]] = {"added": [], "changed": [], "removed": []}
+        seen = set()
+        for path in sorted(self.directory.glob(self.pattern)):
+            name = path.name
+            seen.add(name)
+            st = path.stat()
+            state = self._files.get(name)
+            if state is not None and (state.mtime_ns, state.size) == (st.st_mtime_ns, st.st_size):
+                continue
+            data = path.read_bytes()
+            digest = hashlib.sha1(data).hexdigest()
+            if state is not None and state.digest == digest:
+                state.mtime_ns, state.size = st.st_mtime_ns, st.st_size
+                continue
+            try:
+                df = read_comparables_csv(data)
+            except Exception:
+                continue
+            if state is not None:
+                self._drop(state.file_id)
+                report["changed"].append(name)
+            else:
+                report["added"].append(name)
+            file_id = self._next_id
+            self._next_id += 1
+            self._files[name] = _FileState(st.st_mtime_ns, st.st_size, digest, file_id)
+            self._append(df, file_id)
+        for name in set(self._files) - seen:
+            self._drop(self._files.pop(name).file_id)
+            report["removed"].append(name)
+        return report
+
+    def _append(self, df: pd.DataFrame, file_id: int) -> None:
+        if df.empty:
+            return
+        self._chunks[file_id] = df
+        self._frame = None
+        if "price" in df.columns:
+            new = np.sort(df["price"].dropna().to_numpy(dtype=float))
+            self._prices = np.insert(self._prices, np.searchsorted(self._prices, new), new)
+
+    def _drop(self, file_id: int) -> None:
+        df = self._chunks.pop(file_id, None)
+        if df is None:
+            return
+        self._frame = None
+        if "price" in df.columns:
+            self._prices = _remove_sorted(self._prices, df["price"].dropna().to_numpy(dtype=float))
+
+    def price_bounds(self) -> tuple[float, float]:
+        """Outlier limits (1.5 IQR) over the whole pool, in constant time."""
+
+        n = len(self._prices)
+        if n == 0:
+            return (-math.inf, math.inf)
+        q1 = _sorted_quantile(self._prices.item, n, 0.25)
+        q3 = _sorted_quantile(self._prices.item, n, 0.75)
+        iqr = q3 - q1
+        return float(q1 - 1.5 * iqr), float(q3 + 1.5 * iqr)
+
+    def candidates(self, player, *, age_range: float = 1.0, skill_delta: int = 1) -> pd.DataFrame:
+        """Rows passing the age and skill filters of ``player``."""
+
+        frame = self.frame
+        if frame.empty:
+            return frame
+        mask = pricing._comparables_mask(
+            player,
+            frame,
+            age_range=age_range,
+            skill_delta=skill_delta,
+            price_bounds=(-math.inf, math.inf),
+        )
+        return frame[mask]
+
+    def fingerprint(self) -> str:
+        digests = sorted((name, state.digest) for name, state in self._files.items())
+        return "dir:" + hashlib.sha1(repr(digests).encode("utf-8")).hexdigest()
@@ -0,0 +1,168 @@
+"""Incremental export of prediction tables to CSV, gzipped CSV, JSON lines or Parquet.
+
+Rows are written as they are produced to a binary file: a spooled temporary
+file by default (kept in memory while small, moved to disk past
+``spool_bytes``), or any target such as ``sys.stdout.buffer``.  The whole
+table never has to exist as a single string.  Parquet needs the optional
+``pyarrow`` package.
+"""
+import csv
+import gzip
+import importlib.util
+import io
+import json
+import tempfile
+
+FORMATS = {
+    # format: (file extension, MIME type)
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "jsonl": (".jsonl", "application/x-ndjson"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+SPOOL_BYTES = 8 * 1024 * 1024
+ROW_GROUP_ROWS = 50_000
+
+
+def available_formats() -> list[str]:
+    """Formats usable in this environment (Parquet only with pyarrow)."""
+
+    return [fmt for fmt in FORMATS if fmt != "parquet" or importlib.util.find_spec("pyarrow") is not None]
+
+
+def format_for_path(path: str, default: str = "csv") -> str:
+    """Pick the export format from a file name's extension."""
+
+    name = str(path).lower()
+    for fmt, (ext, _) in sorted(FORMATS.items(), key=lambda item: -len(item[1][0])):
+        if name.endswith(ext):
+            return fmt
+    if name.endswith(".ndjson"):
+        return "jsonl"
+    return default
+
+
+def mime_type(fmt: str) -> str:
+    return FORMATS[fmt][1]
+
+
+class ExportWriter:
+    """Write rows with fixed ``columns`` incrementally in ``fmt``.
+
+    Use :meth:`write` for single rows (dicts) and :meth:`write_frame` for
+    DataFrames, then :meth:`finish` to get the target back, rewound when it
+    is the default spooled file.
+    """
+
+    def __init__(self, fmt: str, columns, target=None, *, spool_bytes: int = SPOOL_BYTES,
+                 row_group_rows: int = ROW_GROUP_ROWS):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown export format {fmt!r} (choose from {', '.join(FORMATS)})")
+        self.fmt = fmt
+        self.columns = [str(c) for c in columns]
+        self.rows = 0
+        self._own = target is None
+        self.target = tempfile.SpooledTemporaryFile(max_size=spool_bytes, mode="w+b") if self._own else target
+        self._gzip = None
+        self._text = None
+        self._parquet = None
+        self._pending: list[dict] = []
+        self._row_group_rows = row_group_rows
+        if fmt == "parquet":
+            if importlib.util.find_spec("pyarrow") is None:
+                raise RuntimeError("Parquet export needs the optional 'pyarrow' package")
+            return
+        raw = self.target
+        if fmt == "csv.gz":
+            # mtime=0 keeps the output identical for identical rows.
+            raw = self._gzip = gzip.GzipFile(fileobj=self.target, mode="wb", mtime=0)
+        self._text = io.TextIOWrapper(raw, encoding="utf-8", newline="", write_through=True)
+        if fmt in ("csv", "csv.gz"):
+            self._csv = csv.DictWriter(self._text, fieldnames=self.columns, extrasaction="ignore",
+                                       lineterminator="\n")
+            self._csv.writeheader()
+
+    def write(self, row: dict) -> None:
+        self.rows += 1
+        if self.fmt == "parquet":
+            self._pending.append(row)
+            if len(self._pending) >= self._row_group_rows:
+                self._flush_parquet()
+        elif self.fmt == "jsonl":
+            self._text.write(json.dumps({c: row.get(c) for c in self.columns}, separators=(",", ":")) + "\n")
+        else:
+            self._csv.writerow(row)
+
+    def write_rows(self, rows) -> None:
+        for row in rows:
+            self.write(row)
+
+    def write_frame(self, df, chunk_rows: int = ROW_GROUP_ROWS) -> None:
+        """Append a DataFrame ``chunk_rows`` rows at a time."""
+
+        df = df[self.columns] if list(map(str, df.columns)) != self.columns else df
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            self.rows += len(chunk)
+            if self.fmt == "parquet":
+                self._flush_parquet()
+                self._write_table(chunk)
+            elif self.fmt == "jsonl":
+                chunk.to_json(self._text, orient="records", lines=True)
+            else:
+                chunk.to_csv(self._text, header=False, index=False, lineterminator="\n")
+
+    def flush(self) -> None:
+        if self._text is not None:
+            self._text.flush()
+        if self._gzip is not None:
+            self._gzip.flush()
+        self.target.flush()
+
+    def finish(self):
+        """Complete the file and return the target."""
+
+        if self.fmt == "parquet":
+            self._flush_parquet()
+            if self._parquet is None:
+                import pyarrow as pa
+
+                self._write_table(pa.table({c: pa.array([], pa.null()) for c in self.columns}))
+            self._parquet.close()
+        else:
+            self._text.flush()
+            self._text.detach()
+            if self._gzip is not None:
+                self._gzip.close()
+        self.target.flush()
+        if self._own:
+            self.target.seek(0)
+        return self.target
+
+    def _write_table(self, data) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.target, table.schema)
+        elif table.schema != self._parquet.schema:
+            table = table.cast(self._parquet.schema)
+        self._parquet.write_table(table)
+
+    def _flush_parquet(self) -> None:
+        if not self._pending:
+            return
+        import pyarrow as pa
+
+        self._write_table(pa.Table.from_pylist([{c: row.get(c) for c in self.columns} for row in self._pending]))
+        self._pending = []
+
+
+def export_frame(df, fmt: str = "csv", **kwargs):
+    """Write ``df`` to a rewound spooled temporary file in ``fmt``."""
+
+    writer = ExportWriter(fmt, df.columns, **kwargs)
+    writer.write_frame(df)
+    return writer.finish()
@@ -2,6 +2,8 @@ import io
 import re
 import pandas as pd
 
+from instrumentation import span
+
 SPECIALTY_MAP = {
     "None":"None","Ninguna":"None","No":"None",
     "Technical":"Technical","Técnico":"Technical",
@@ -26,6 +28,12 @@ def _to_int(x, default=0):
             return default
 
 def parse_ho_csv(text:str):
+    with span("ho_import.parse_csv") as s:
+        df = _parse_ho_csv(text)
+        s.rows = len(df)
+    return df
+
+def _parse_ho_csv(text:str):
     for sep in [",",";","\t","|"]:
         try:
             df = pd.read_csv(io.StringIO(text), sep=sep)
@@ -1,3 +1,5 @@
+import hashlib
+import io
 from datetime import datetime
 from dateutil import tz
 
@@ -21,3 +23,52 @@ END:VEVENT
 END:VCALENDAR
 """
     return ics.encode("utf-8")
+
+def _escape(text:str)->str:
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def _fold(line:str)->str:
+    # RFC 5545 limits content lines to 75 octets; continuations start with a space.
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1  # do not split a UTF-8 sequence
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+def event_uid(title:str, start:datetime, seq:int)->str:
+    """Stable per-event UID: the same plan exported twice updates, not duplicates."""
+    digest = hashlib.sha1(f"{title}|{_fmt(start)}".encode("utf-8")).hexdigest()[:12]
+    return f"{_fmt(start)}-{seq}-{digest}@httraderpro"
+
+def write_ics_events(fp, events, dtstamp:datetime|None=None)->int:
+    """Stream a multi-event calendar to the text file ``fp``.
+
+    ``events`` yields dicts with ``title``, ``start`` and optionally ``end``,
+    ``description`` and ``uid``.  Returns the number of events written.
+    """
+    stamp = _fmt(dtstamp or datetime.now(tz.UTC))
+    fp.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//HT Trader Pro//EN\r\nCALSCALE:GREGORIAN\r\n")
+    n = 0
+    for n, event in enumerate(events, start=1):
+        start = event["start"]
+        fp.write("BEGIN:VEVENT\r\n")
+        fp.write(_fold(f"UID:{event.get('uid') or event_uid(event['title'], start, n)}"))
+        fp.write(f"DTSTAMP:{stamp}\r\nDTSTART:{_fmt(start)}\r\nDTEND:{_fmt(event.get('end') or start)}\r\n")
+        fp.write(_fold(f"SUMMARY:{_escape(event['title'])}"))
+        if event.get("description"):
+            fp.write(_fold(f"DESCRIPTION:{_escape(event['description'])}"))
+        fp.write("END:VEVENT\r\n")
+    fp.write("END:VCALENDAR\r\n")
+    return n
+
+def make_ics(events, dtstamp:datetime|None=None)->bytes:
+    buf = io.StringIO()
+    write_ics_events(buf, events, dtstamp)
+    return buf.getvalue().encode("utf-8")
@@ -0,0 +1,88 @@
+"""Measure how long app modules take to import in a fresh interpreter.
+
+Usage::
+
+    python -m app.import_times                 # every module, slowest first
+    python -m app.import_times pricing --detail 10
+
+Each module is imported in a new process, so the time includes everything it
+pulls in, as on a cold start.  ``--detail`` lists the slowest imports below
+it using ``python -X importtime``.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+
+# app.py runs the Streamlit script when imported and this module measures
+# itself, so neither is part of the default set.
+DEFAULT_MODULES = sorted(p.stem for p in APP_DIR.glob("*.py") if p.stem not in ("app", "import_times"))
+
+_PROBE = (
+    "import sys, time; sys.path.insert(0, {app_dir!r}); "
+    "t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+)
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=APP_DIR, check=True)
+
+
+def measure(module: str, *, repeat: int = 3) -> float:
+    """Best-of-``repeat`` cold import time of ``module`` in seconds."""
+
+    code = _PROBE.format(app_dir=str(APP_DIR), module=module)
+    return min(float(_run(["-c", code]).stdout.strip()) for _ in range(repeat))
+
+
+def measure_all(modules: list[str] | None = None, *, repeat: int = 3) -> dict[str, float]:
+    """Cold import times of ``modules`` (default: every app module), slowest first."""
+
+    times = {module: measure(module, repeat=repeat) for module in modules or DEFAULT_MODULES}
+    return dict(sorted(times.items(), key=lambda item: item[1], reverse=True))
+
+
+def import_breakdown(module: str, top: int = 15) -> list[tuple[str, float, float]]:
+    """``(package, self_s, cumulative_s)`` of the slowest imports under ``module``."""
+
+    code = f"import sys; sys.path.insert(0, {str(APP_DIR)!r}); import {module}"
+    stderr = _run(["-X", "importtime", "-c", code]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:top]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="import_times", description="Measure cold import times of app modules.")
+    parser.add_argument("modules", nargs="*", help=f"modules to measure (default: all {len(DEFAULT_MODULES)})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--detail", type=int, default=0, metavar="N", help="show the N slowest nested imports")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    times = {}
+    for module in args.modules or DEFAULT_MODULES:
+        try:
+            times[module] = measure(module, repeat=args.repeat)
+        except subprocess.CalledProcessError as e:
+            failed += 1
+            reason = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else f"exit code {e.returncode}"
+            print(f"warning: cannot import {module}: {reason}", file=sys.stderr)
+    width = max(map(len, times), default=0)
+    for module, seconds in sorted(times.items(), key=lambda item: item[1], reverse=True):
+        print(f"{module:<{width}}  {seconds * 1000:8.1f} ms")
+        if args.detail:
+            for name, _, cumulative in import_breakdown(module, args.detail)[1:]:
+                print(f"  {name:<{width + 20}}{cumulative * 1000:8.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
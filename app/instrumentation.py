@@ -0,0 +1,149 @@
+"""Lightweight timing spans and counters for the pricing pipeline.
+
+Disabled by default: :func:`span` then returns a shared no-op context manager
+and :func:`count` returns immediately.  ``HT_PROFILE=1`` turns recording on
+for every context; :func:`enable` switches it for the current context only.
+Measurements go to the :class:`Stats` bound to the current context (see
+:func:`use`), so each Streamlit session keeps its own switch and numbers.
+"""
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+_ENABLED = os.getenv("HT_PROFILE", "") not in ("", "0")
+
+
+class Stats:
+    """Per-stage call counts, wall time and row counts plus named counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages: dict[str, list[float]] = {}
+            self.counters: dict[str, int] = {}
+
+    def record(self, name: str, elapsed: float, rows: int | None = None) -> None:
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                # calls, total seconds, max seconds, rows
+                stage = self.stages[name] = [0, 0.0, 0.0, 0]
+            stage[0] += 1
+            stage[1] += elapsed
+            if elapsed > stage[2]:
+                stage[2] = elapsed
+            if rows is not None:
+                stage[3] += rows
+
+    def add(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {
+                name: {
+                    "calls": int(calls),
+                    "total_ms": total * 1000,
+                    "mean_ms": total * 1000 / calls if calls else 0.0,
+                    "max_ms": peak * 1000,
+                    "rows": int(rows),
+                }
+                for name, (calls, total, peak, rows) in sorted(self.stages.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+        return {"stages": stages, "counters": counters}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix: str = "httrader") -> str:
+        snap = self.snapshot()
+        lines = []
+        metrics = [
+            ("stage_calls_total", "counter", "Number of times the stage ran.", "calls", 1),
+            ("stage_seconds_total", "counter", "Wall time spent in the stage.", "total_ms", 1e-3),
+            ("stage_seconds_max", "gauge", "Slowest single run of the stage.", "max_ms", 1e-3),
+            ("stage_rows_total", "counter", "Rows processed by the stage.", "rows", 1),
+        ]
+        for metric, kind, help_text, key, factor in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, stage in snap["stages"].items():
+                lines.append(f'{prefix}_{metric}{{stage="{name}"}} {stage[key] * factor:g}')
+        lines.append(f"# HELP {prefix}_events_total Named event counters.")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in snap["counters"].items():
+            lines.append(f'{prefix}_events_total{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+GLOBAL_STATS = Stats()
+_current: ContextVar[Stats] = ContextVar("pricing_stats", default=GLOBAL_STATS)
+# None means "use the HT_PROFILE default".
+_enabled: ContextVar[bool | None] = ContextVar("pricing_profiling", default=None)
+
+
+class _NullSpan:
+    __slots__ = ("rows",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Span:
+    __slots__ = ("name", "rows", "_start")
+
+    def __init__(self, name: str, rows: int | None):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _current.get().record(self.name, time.perf_counter() - self._start, self.rows)
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable(flag: bool = True):
+    """Turn recording on or off in the current context only."""
+    return _enabled.set(flag)
+
+
+def enabled() -> bool:
+    flag = _enabled.get()
+    return _ENABLED if flag is None else flag
+
+
+def use(stats: Stats):
+    """Send measurements in the current context to ``stats``."""
+    return _current.set(stats)
+
+
+def current() -> Stats:
+    return _current.get()
+
+
+def span(name: str, rows: int | None = None):
+    """Time a block; set ``.rows`` on the returned object to record row counts."""
+    if not enabled():
+        return _NULL_SPAN
+    return _Span(name, rows)
+
+
+def count(name: str, n: int = 1) -> None:
+    if enabled():
+        _current.get().add(name, n)
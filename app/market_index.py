@@ -0,0 +1,222 @@
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pricing_model import DATA_PATH
+
+PRIMARY_SKILLS = ["playmaking", "passing", "defending", "scoring", "winger", "goalkeeping"]
+DATE_COLUMNS = ["deadline", "sale_date", "date"]
+
+# Log-spaced price bins shared by every bucket sketch: 0.02 decades (~5%)
+# per bin between 1e3 and 1e10.  Prices outside the range land in the edge bins.
+_LOG_LOW = 3.0
+_LOG_HIGH = 10.0
+_N_BINS = 350
+_BIN_WIDTH = (_LOG_HIGH - _LOG_LOW) / _N_BINS
+
+
+_EPOCH = pd.Timestamp(0, tz="UTC")
+
+
+def _week_number(ts) -> int:
+    ts = pd.Timestamp(ts)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int((ts - _EPOCH).days // 7)
+
+
+def _age_years(player) -> float | None:
+    age = player.get("age_years")
+    if age is None and (age_days := player.get("age_days")) is not None:
+        age = age_days / 365
+    return age
+
+
+def primary_skill_level(player) -> int:
+    """Level of the player's strongest core skill."""
+
+    return int(max((player.get(s) or 0) for s in PRIMARY_SKILLS))
+
+
+def _sketch_quantile(counts: np.ndarray, q: float) -> float:
+    total = counts.sum()
+    if total == 0:
+        return math.nan
+    cum = np.cumsum(counts)
+    target = q * total
+    idx = int(np.searchsorted(cum, target, side="left"))
+    idx = min(idx, _N_BINS - 1)
+    before = cum[idx - 1] if idx else 0
+    inside = counts[idx]
+    frac = (target - before) / inside if inside else 0.5
+    return float(10 ** (_LOG_LOW + (idx + frac) * _BIN_WIDTH))
+
+
+class MarketPriceIndex:
+    """Rolling price distribution per age band and primary-skill level.
+
+    Sales are aggregated into fixed log-price histograms per bucket and week.
+    Each bucket also keeps the running sum over the window, so adding sales
+    and expiring old weeks only touch the affected buckets, and a quantile
+    lookup costs a single pass over the fixed number of bins.  The index can
+    be shared between threads.
+    """
+
+    def __init__(self, window_weeks: int = 8, age_band_years: float = 1.0):
+        self.window_weeks = window_weeks
+        self.age_band_years = age_band_years
+        self._weeks: dict[int, dict[tuple[int, int], np.ndarray]] = {}
+        self._totals: dict[tuple[int, int], np.ndarray] = {}
+        self._latest_week: int | None = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_csv(cls, path: Path = DATA_PATH, **kwargs) -> "MarketPriceIndex":
+        index = cls(**kwargs)
+        index.add(pd.read_csv(path))
+        return index
+
+    def add_store(self, store, *, now=None) -> int:
+        """Add the sales of a :class:`market_store.MarketStore`, dated by their deadlines."""
+
+        return self.add(store.to_frame(columns=[*store.columns(), "deadline"]), now=now)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(sum(t.sum() for t in self._totals.values()))
+
+    def bucket(self, player) -> tuple[int, int] | None:
+        age = _age_years(player)
+        if age is None:
+            return None
+        return int(age // self.age_band_years), primary_skill_level(player)
+
+    def _frame_weeks(self, df: pd.DataFrame, now) -> np.ndarray:
+        now_week = _week_number(now if now is not None else pd.Timestamp.now(tz="UTC"))
+        for col in DATE_COLUMNS:
+            if col in df.columns:
+                dates = pd.to_datetime(df[col], errors="coerce", utc=True)
+                days = (dates - _EPOCH).dt.days
+                return (days // 7).fillna(now_week).to_numpy(dtype=np.int64)
+        return np.full(len(df), now_week, dtype=np.int64)
+
+    def add(self, df: pd.DataFrame, *, now=None) -> int:
+        """Aggregate the sales in ``df`` and return how many were counted.
+
+        Sales are assigned to the week of their ``deadline``/``sale_date``
+        column, or to the week of ``now`` when the frame carries no dates.
+        """
+
+        with self._lock:
+            return self._add(df, now)
+
+    def _add(self, df: pd.DataFrame, now) -> int:
+        if df is None or df.empty or "price" not in df.columns:
+            return 0
+        if "age_years" in df.columns:
+            age = df["age_years"].to_numpy(dtype=float)
+        elif "age_days" in df.columns:
+            age = df["age_days"].to_numpy(dtype=float) / 365
+        else:
+            return 0
+        keep = (df["price"].to_numpy(dtype=float) > 0) & ~np.isnan(age)
+        if not keep.any():
+            return 0
+        df, age = df[keep], age[keep]
+        skills = [s for s in PRIMARY_SKILLS if s in df.columns]
+        level = df[skills].fillna(0).max(axis=1).to_numpy(dtype=np.int64) if skills else np.zeros(len(df), np.int64)
+        log_price = np.log10(df["price"].to_numpy(dtype=float))
+        bins = np.clip(((log_price - _LOG_LOW) / _BIN_WIDTH).astype(np.int64), 0, _N_BINS - 1)
+
+        grouped = pd.DataFrame({
+            "week": self._frame_weeks(df, now),
+            "band": np.floor(age / self.age_band_years).astype(np.int64),
+            "level": level,
+            "bin": bins,
+        }).value_counts()
+
+        latest = int(grouped.index.get_level_values("week").max())
+        if self._latest_week is not None:
+            latest = max(latest, self._latest_week)
+        oldest = latest - self.window_weeks + 1
+        added = 0
+        for (week, band, lvl, b), n in grouped.items():
+            if week < oldest:
+                continue
+            key = (int(band), int(lvl))
+            week_hist = self._weeks.setdefault(int(week), {})
+            if key not in week_hist:
+                week_hist[key] = np.zeros(_N_BINS, dtype=np.int64)
+            week_hist[key][b] += n
+            if key not in self._totals:
+                self._totals[key] = np.zeros(_N_BINS, dtype=np.int64)
+            self._totals[key][b] += n
+            added += int(n)
+        self._advance(latest)
+        return added
+
+    def advance_to(self, now=None) -> None:
+        """Move the window to the week of ``now`` (default: the current time)."""
+
+        self.advance(_week_number(now if now is not None else pd.Timestamp.now(tz="UTC")))
+
+    def advance(self, week: int) -> None:
+        """Move the window so it ends at ``week``, expiring older weeks."""
+
+        with self._lock:
+            self._advance(week)
+
+    def _advance(self, week: int) -> None:
+        if self._latest_week is not None and week < self._latest_week:
+            return
+        self._latest_week = week
+        oldest = week - self.window_weeks + 1
+        for old in [w for w in self._weeks if w < oldest]:
+            for key, hist in self._weeks.pop(old).items():
+                total = self._totals[key]
+                total -= hist
+                if not total.any():
+                    del self._totals[key]
+
+    def count(self, age_years: float, level: int) -> int:
+        hist = self._totals.get((int(age_years // self.age_band_years), int(level)))
+        return int(hist.sum()) if hist is not None else 0
+
+    def quantile(self, age_years: float, level: int, q: float) -> float:
+        hist = self._totals.get((int(age_years // self.age_band_years), int(level)))
+        return _sketch_quantile(hist, q) if hist is not None else math.nan
+
+    def lookup(self, player) -> dict | None:
+        """Return count and price quantiles for the player's bucket."""
+
+        key = self.bucket(player)
+        with self._lock:
+            hist = self._totals.get(key) if key is not None else None
+            if hist is None:
+                return None
+            hist = hist.copy()
+        return {
+            "count": int(hist.sum()),
+            "p05": _sketch_quantile(hist, 0.05),
+            "p25": _sketch_quantile(hist, 0.25),
+            "median": _sketch_quantile(hist, 0.5),
+            "p75": _sketch_quantile(hist, 0.75),
+            "p95": _sketch_quantile(hist, 0.95),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        with self._lock:
+            totals = sorted((key, hist.copy()) for key, hist in self._totals.items())
+        rows = [
+            {
+                "age_band": band * self.age_band_years,
+                "level": level,
+                "count": int(hist.sum()),
+                "median": _sketch_quantile(hist, 0.5),
+            }
+            for (band, level), hist in totals
+        ]
+        return pd.DataFrame(rows, columns=["age_band", "level", "count", "median"])
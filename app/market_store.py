@@ -0,0 +1,270 @@
+import io
+import math
+import sqlite3
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+# Columns persisted for every sale.  ``age_years`` is not stored: comparables
+# are filtered on ``age_days / 365`` exactly like ``pricing._filter_comparables``
+# does for frames without an ``age_years`` column.
+SALE_COLUMNS = [
+    "price",
+    "playmaking",
+    "passing",
+    "defending",
+    "scoring",
+    "winger",
+    "form",
+    "tsi",
+    "age_days",
+    "specialty_index",
+    "goalkeeping",
+    "set_pieces",
+]
+SKILL_COLUMNS = ["playmaking", "passing", "defending", "scoring", "winger", "goalkeeping"]
+IDENTITY_COLUMNS = ["player_id", "deadline"]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sales (
+    sale_key TEXT PRIMARY KEY,
+    player_id INTEGER,
+    deadline TEXT,
+    {", ".join(f"{c} REAL" for c in SALE_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS idx_sales_age_skills
+    ON sales(age_days, {", ".join(SKILL_COLUMNS)});
+CREATE INDEX IF NOT EXISTS idx_sales_gk_age ON sales(goalkeeping, age_days);
+CREATE INDEX IF NOT EXISTS idx_sales_price ON sales(price);
+"""
+
+
+def _detect_sep(source) -> str:
+    """Guess whether a CSV source is ``,`` or ``;`` separated."""
+
+    if hasattr(source, "read"):
+        pos = source.tell()
+        header = source.readline()
+        source.seek(pos)
+    else:
+        with open(source, "rb") as f:
+            header = f.readline()
+    if isinstance(header, bytes):
+        header = header.decode("utf-8", errors="ignore")
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def read_comparables_csv(source, **kwargs) -> pd.DataFrame:
+    """Read a comparables CSV that may be ``,`` or ``;`` separated."""
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return pd.read_csv(source, sep=_detect_sep(source), **kwargs)
+
+
+def sale_keys(df: pd.DataFrame) -> pd.Series:
+    """Return the identity of each sale used for de-duplication.
+
+    An explicit ``sale_id`` column wins, then ``player_id`` combined with the
+    auction ``deadline``; otherwise the sale is identified by its content.
+    """
+
+    if "sale_id" in df.columns:
+        return "id:" + df["sale_id"].astype(str)
+    if all(c in df.columns for c in IDENTITY_COLUMNS):
+        return "pd:" + df["player_id"].astype(str) + "@" + df["deadline"].astype(str)
+    cols = [c for c in SALE_COLUMNS if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[cols], index=False)
+    return "h:" + hashed.map("{:016x}".format)
+
+
+def _sorted_quantile(values_at, n: int, q: float) -> float:
+    """Linear-interpolated quantile matching ``pandas.Series.quantile``."""
+
+    pos = q * (n - 1)
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    low_val = values_at(lo)
+    if hi == lo:
+        return low_val
+    return low_val + (values_at(hi) - low_val) * (pos - lo)
+
+
+class MarketStore:
+    """SQLite-backed store of historical sales used as comparables."""
+
+    def __init__(self, path: Path | str = ":memory:"):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._bounds: tuple[float, float] | None = None
+        self._columns: list[str] | None = None
+        # In-memory stores all share the path ":memory:", so they are told
+        # apart by a random token; file stores are named by their path.
+        self._token = uuid.uuid4().hex
+        self._generation = 0
+        self._last_rowid: int | None = None
+        self._data_version = self._read_data_version()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM sales").fetchone()[0]
+
+    def _read_data_version(self) -> int | None:
+        if self.path == ":memory:":
+            return None
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync(self) -> int | None:
+        """Drop derived caches when another connection committed to the file."""
+
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            self._bounds = None
+            self._columns = None
+            self._last_rowid = None
+        return version
+
+    def fingerprint(self) -> str:
+        """Identify the store content; rows are only ever added.
+
+        A database file is identified by its resolved path and its highest
+        rowid, which survives restarts so persisted cache entries keep
+        matching; the rowid is re-read after this or another connection
+        inserts.  An in-memory store uses its token and insert count.
+        """
+
+        if self.path == ":memory:":
+            return f"sqlite:{self._token}:{self._generation}"
+        self._sync()
+        if self._last_rowid is None:
+            self._last_rowid = self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM sales").fetchone()[0]
+        return f"sqlite:{Path(self.path).resolve()}:{self._last_rowid}"
+
+    def ingest_frame(self, df: pd.DataFrame) -> int:
+        """Bulk insert sales from ``df`` and return the number of new rows."""
+
+        if df is None or df.empty or "price" not in df.columns:
+            return 0
+        df = df[df["price"].notna()]
+        if "age_days" not in df.columns and "age_years" in df.columns:
+            df = df.assign(age_days=df["age_years"] * 365)
+        out = pd.DataFrame({"sale_key": sale_keys(df)})
+        for col in IDENTITY_COLUMNS + SALE_COLUMNS:
+            out[col] = df[col] if col in df.columns else None
+        out = out.astype(object).where(out.notna(), None)
+
+        placeholders = ", ".join("?" for _ in out.columns)
+        sql = f"INSERT OR IGNORE INTO sales ({', '.join(out.columns)}) VALUES ({placeholders})"
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(sql, out.itertuples(index=False, name=None))
+        inserted = self.conn.total_changes - before
+        if inserted:
+            self._generation += 1
+            self._bounds = None
+            self._columns = None
+            self._last_rowid = None
+            self.conn.execute("ANALYZE")
+        return inserted
+
+    def ingest_csv(self, source, *, chunksize: int = 50_000) -> int:
+        """Stream a comparables CSV into the store in chunks."""
+
+        inserted = 0
+        for chunk in read_comparables_csv(source, chunksize=chunksize):
+            inserted += self.ingest_frame(chunk)
+        return inserted
+
+    def columns(self) -> list[str]:
+        """Sale columns holding at least one value.
+
+        Columns never provided by any ingested file are left out, matching a
+        comparables frame that simply lacks them.
+        """
+
+        self._sync()
+        if self._columns is None:
+            counts = self.conn.execute(
+                f"SELECT {', '.join(f'COUNT({c})' for c in SALE_COLUMNS)} FROM sales"
+            ).fetchone()
+            self._columns = [c for c, n in zip(SALE_COLUMNS, counts) if n]
+        return self._columns
+
+    def price_bounds(self) -> tuple[float, float]:
+        """Outlier limits (1.5 IQR) over every stored price."""
+
+        self._sync()
+        if self._bounds is None:
+            n = len(self)
+            if n == 0:
+                return (-math.inf, math.inf)
+
+            def value_at(offset: int) -> float:
+                row = self.conn.execute(
+                    "SELECT price FROM sales ORDER BY price LIMIT 1 OFFSET ?", (offset,)
+                ).fetchone()
+                return float(row[0])
+
+            q1 = _sorted_quantile(value_at, n, 0.25)
+            q3 = _sorted_quantile(value_at, n, 0.75)
+            iqr = q3 - q1
+            self._bounds = (q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+        return self._bounds
+
+    def candidates(
+        self,
+        player,
+        *,
+        age_range: float = 1.0,
+        skill_delta: int = 1,
+    ) -> pd.DataFrame:
+        """Return sales passing the age and skill filters of ``player``.
+
+        The outlier filter is left to ``pricing._filter_comparables`` together
+        with :meth:`price_bounds`, which covers the whole market.
+        """
+
+        columns = self.columns()
+        if not columns:
+            return pd.DataFrame()
+        clauses = []
+        params: list[float] = []
+        player_age = player.get("age_years")
+        if player_age is None and (age_days := player.get("age_days")) is not None:
+            player_age = age_days / 365
+        if player_age is not None and "age_days" in columns:
+            # Widen slightly so float rounding never drops a boundary row;
+            # the exact bounds are re-applied in memory.
+            clauses.append("age_days BETWEEN ? AND ?")
+            params += [(player_age - age_range) * 365 - 1e-6, (player_age + age_range) * 365 + 1e-6]
+        for col in SKILL_COLUMNS:
+            p_val = player.get(col)
+            if p_val is not None and col in columns:
+                clauses.append(f"{col} BETWEEN ? AND ?")
+                params += [p_val - skill_delta, p_val + skill_delta]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM sales {where}", self.conn, params=params)
+
+    def to_frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Return the whole market as a DataFrame.
+
+        ``columns`` defaults to :meth:`columns`; the identity columns
+        (``player_id``, ``deadline``) may be requested as well.
+        """
+
+        if columns is None:
+            columns = self.columns()
+        unknown = set(columns) - set(IDENTITY_COLUMNS + SALE_COLUMNS)
+        if unknown:
+            raise ValueError(f"unknown sale columns: {', '.join(sorted(unknown))}")
+        if not columns:
+            return pd.DataFrame()
+        return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM sales", self.conn)
@@ -0,0 +1,254 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from market_index import DATE_COLUMNS, PRIMARY_SKILLS, _age_years, primary_skill_level
+from pricing_model import DATA_PATH, FEATURES_GK
+
+FEATURES = FEATURES_GK
+
+DEFAULT_TZ = "America/Santiago"
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+N_SLOTS = 7 * SLOTS_PER_DAY
+
+# A clock time followed by a UTC offset or zone marker, e.g. "15:45-03:00".
+_OFFSET = r"\d:\d{2}(?::\d{2}(?:\.\d*)?)?\s*(?:Z|UTC|GMT|[+-]\d{2}(?::?\d{2})?)$"
+
+
+def _localize_naive(dates: pd.Series, tzname: str) -> pd.Series:
+    # Repeated or skipped wall times around DST changes still count.
+    ambiguous = np.zeros(len(dates), dtype=bool)
+    return dates.dt.tz_localize(tzname, ambiguous=ambiguous, nonexistent="shift_forward")
+
+
+def _parse(text: pd.Series, **kwargs) -> pd.Series:
+    # The inferred format is fast; only values it misses go through "mixed".
+    parsed = pd.to_datetime(text, errors="coerce", **kwargs)
+    retry = parsed.isna() & text.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(text[retry], errors="coerce", format="mixed", **kwargs)
+    return parsed
+
+
+def _to_local(values: pd.Series, tzname: str) -> pd.Series:
+    """Parse deadlines into ``tzname``; unparseable values become ``NaT``.
+
+    Values with an explicit offset are converted, so exports whose offsets
+    change across a DST switch parse as one column; naive values are read
+    as wall-clock times in ``tzname``.
+    """
+
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values.dt.tz_convert(tzname)
+    if pd.api.types.is_datetime64_dtype(values.dtype):
+        return _localize_naive(values, tzname)
+    text = values.astype("string").str.strip()
+    aware = text.str.contains(_OFFSET, case=False, regex=True).fillna(False).to_numpy(dtype=bool)
+    out = pd.Series(pd.NaT, index=values.index, dtype=pd.DatetimeTZDtype(tz=tzname))
+    if aware.any():
+        out[aware] = _parse(text[aware], utc=True).dt.tz_convert(tzname)
+    if not aware.all():
+        out[~aware] = _localize_naive(_parse(text[~aware]), tzname)
+    return out
+
+
+class PeakSlotHistogram:
+    """Sale-price premium per weekday and 15-minute expiry slot.
+
+    A slot's premium is the mean residual of its sales under a linear
+    log-price model on the pricing features, so it reflects timing rather
+    than which players happened to sell then.  Everything is kept as running
+    sums: the model's normal equations, plus per slot the sale count, log-price
+    sum and feature sums, for the whole market and per segment (age band and
+    primary-skill level).  Adding sales only updates those sums and a lookup
+    never regroups history.  Thinly traded slots are shrunk towards no
+    premium, and sparse segment slots towards the market-wide premium.
+
+    Deadlines without a timezone are taken to be in ``tzname``.
+    """
+
+    def __init__(self, tzname: str = DEFAULT_TZ, *, age_band_years: float = 2.0, shrinkage: float = 20.0,
+                 min_samples: int = 5):
+        self.tzname = tzname
+        self.age_band_years = age_band_years
+        self.shrinkage = shrinkage
+        self.min_samples = min_samples
+        n_terms = len(FEATURES) + 1
+        self._xtx = np.zeros((n_terms, n_terms))
+        self._xty = np.zeros(n_terms)
+        self._counts: dict[tuple[int, int] | None, np.ndarray] = {}
+        self._sums: dict[tuple[int, int] | None, np.ndarray] = {}
+        self._feature_sums: dict[tuple[int, int] | None, np.ndarray] = {}
+        self._cache: dict = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_csv(cls, path: Path = DATA_PATH, **kwargs) -> "PeakSlotHistogram":
+        hist = cls(**kwargs)
+        hist.add(pd.read_csv(path))
+        return hist
+
+    def add_store(self, store) -> int:
+        """Fold in the sales of a :class:`market_store.MarketStore` with their deadlines."""
+
+        return self.add(store.to_frame(columns=[*store.columns(), "deadline"]))
+
+    def __len__(self) -> int:
+        counts = self._counts.get(None)
+        return int(counts.sum()) if counts is not None else 0
+
+    def segment(self, player) -> tuple[int, int] | None:
+        age = _age_years(player)
+        if age is None:
+            return None
+        return int(age // self.age_band_years), primary_skill_level(player)
+
+    def _slots(self, df: pd.DataFrame) -> np.ndarray | None:
+        col = next((c for c in DATE_COLUMNS if c in df.columns), None)
+        if col is None:
+            return None
+        dates = _to_local(df[col], self.tzname)
+        slots = dates.dt.weekday * SLOTS_PER_DAY + (dates.dt.hour * 60 + dates.dt.minute) // SLOT_MINUTES
+        return slots.fillna(-1).to_numpy(dtype=np.int64)
+
+    def add(self, df: pd.DataFrame) -> int:
+        """Fold the sales in ``df`` into the histogram; returns how many were used.
+
+        Sales need a price and a ``deadline``/``sale_date``/``date`` column.
+        """
+
+        if df is None or df.empty or "price" not in df.columns:
+            return 0
+        slots = self._slots(df)
+        if slots is None:
+            return 0
+        price = df["price"].to_numpy(dtype=float)
+        keep = (slots >= 0) & (price > 0)
+        if not keep.any():
+            return 0
+        df, slots, log_price = df[keep], slots[keep], np.log(price[keep])
+
+        if "age_years" in df.columns:
+            age = df["age_years"].to_numpy(dtype=float)
+        elif "age_days" in df.columns:
+            age = df["age_days"].to_numpy(dtype=float) / 365
+        else:
+            age = np.full(len(df), np.nan)
+        skills = [s for s in PRIMARY_SKILLS if s in df.columns]
+        level = df[skills].fillna(0).max(axis=1).to_numpy(dtype=np.int64) if skills else np.zeros(len(df), np.int64)
+        band = np.where(np.isnan(age), -1, np.floor(np.nan_to_num(age) / self.age_band_years)).astype(np.int64)
+        X = np.column_stack([np.ones(len(df)), df.reindex(columns=FEATURES, fill_value=0).fillna(0).to_numpy(dtype=float)])
+
+        codes, inverse = np.unique(np.stack([band, level], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        with self._lock:
+            self._xtx += X.T @ X
+            self._xty += X.T @ log_price
+            self._accumulate(None, slots, log_price, X)
+            for i, (b, lvl) in enumerate(codes):
+                if b < 0:
+                    continue
+                mask = inverse == i
+                self._accumulate((int(b), int(lvl)), slots[mask], log_price[mask], X[mask])
+            self._cache.clear()
+        return int(len(slots))
+
+    def _accumulate(self, key, slots: np.ndarray, log_price: np.ndarray, X: np.ndarray) -> None:
+        if key not in self._counts:
+            self._counts[key] = np.zeros(N_SLOTS, dtype=np.int64)
+            self._sums[key] = np.zeros(N_SLOTS, dtype=float)
+            self._feature_sums[key] = np.zeros((N_SLOTS, X.shape[1]), dtype=float)
+        self._counts[key] += np.bincount(slots, minlength=N_SLOTS)
+        self._sums[key] += np.bincount(slots, weights=log_price, minlength=N_SLOTS)
+        feature_sums = self._feature_sums[key]
+        for j in range(X.shape[1]):
+            feature_sums[:, j] += np.bincount(slots, weights=X[:, j], minlength=N_SLOTS)
+
+    def _coefficients(self) -> np.ndarray:
+        beta = self._cache.get("beta")
+        if beta is None:
+            beta = self._cache["beta"] = np.linalg.lstsq(self._xtx, self._xty, rcond=None)[0]
+        return beta
+
+    def _raw_premium(self, key) -> tuple[np.ndarray, np.ndarray]:
+        counts = self._counts[key]
+        residuals = self._sums[key] - self._feature_sums[key] @ self._coefficients()
+        mean = residuals.sum() / counts.sum()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            premium = np.where(counts > 0, residuals / counts - mean, 0.0)
+        return premium, counts
+
+    def premiums(self, player=None) -> tuple[np.ndarray, np.ndarray]:
+        """``(premium, samples)`` per slot for ``player``'s segment (or the market).
+
+        Premiums are relative price differences, e.g. ``0.05`` for 5% above
+        the segment's average sale.
+        """
+
+        key = self.segment(player) if player is not None else None
+        # Readers hold the lock too, so a lookup overlapping add() can never
+        # put results from the old sums back into the freshly cleared cache.
+        with self._lock:
+            return self._premiums(key)
+
+    def _premiums(self, key) -> tuple[np.ndarray, np.ndarray]:
+        cached = self._cache.get(("premiums", key))
+        if cached is not None:
+            return cached
+        if None not in self._counts:
+            result = np.zeros(N_SLOTS), np.zeros(N_SLOTS, dtype=np.int64)
+        else:
+            raw_market, market_counts = self._raw_premium(None)
+            market = raw_market * market_counts / (market_counts + self.shrinkage)
+            if key is None or key not in self._counts:
+                premium, counts = market, market_counts
+            else:
+                raw, counts = self._raw_premium(key)
+                weight = counts / (counts + self.shrinkage)
+                premium = weight * raw + (1 - weight) * market
+            result = np.expm1(premium), counts
+        self._cache[("premiums", key)] = result
+        return result
+
+    def top_windows(self, player=None, k: int = 3, *, min_gap_minutes: int = 60) -> list[dict]:
+        """The ``k`` highest-premium slots, at least ``min_gap_minutes`` apart.
+
+        Only slots with ``min_samples`` market-wide sales are considered.
+        Each window is a dict with ``weekday``, ``hour``, ``minute``,
+        ``premium`` and ``samples``.
+        """
+
+        key = self.segment(player) if player is not None else None
+        with self._lock:
+            return self._top_windows(key, k, min_gap_minutes)
+
+    def _top_windows(self, key, k: int, min_gap_minutes: int) -> list[dict]:
+        cache_key = ("top", key, k, min_gap_minutes)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+        premium, counts = self._premiums(key)
+        market_counts = self._counts.get(None)
+        windows: list[dict] = []
+        if market_counts is not None:
+            gap = max(1, min_gap_minutes // SLOT_MINUTES)
+            chosen: list[int] = []
+            candidates = np.flatnonzero(market_counts >= self.min_samples)
+            for slot in candidates[np.argsort(-premium[candidates], kind="stable")]:
+                if any(min(abs(slot - c), N_SLOTS - abs(slot - c)) < gap for c in chosen):
+                    continue
+                chosen.append(int(slot))
+                weekday, minute = divmod(int(slot), SLOTS_PER_DAY)
+                windows.append({
+                    "weekday": weekday,
+                    "hour": minute * SLOT_MINUTES // 60,
+                    "minute": minute * SLOT_MINUTES % 60,
+                    "premium": float(premium[slot]),
+                    "samples": int(counts[slot]),
+                })
+                if len(windows) == k:
+                    break
+        self._cache[cache_key] = windows
+        return windows
@@ -0,0 +1,211 @@
+"""Compact player records shared by the UI tabs, the CLI and the pricing paths.
+
+:class:`Player` is a ``__slots__`` record with a dict-like ``get`` so it can be
+passed wherever pricing expects a player mapping.  :class:`PlayerBatch` keeps a
+squad column by column and hands the pricing model its feature matrix
+directly.
+"""
+import numpy as np
+import pandas as pd
+
+from ho_import import ho_specialty_to_index
+
+SPECIALTY_NAMES = ("None", "Technical", "Quick", "Unpredictable", "Powerful", "Head")
+
+INT_FIELDS = (
+    "age_years",
+    "age_days",
+    "playmaking",
+    "passing",
+    "defending",
+    "scoring",
+    "winger",
+    "goalkeeping",
+    "set_pieces",
+    "stamina",
+    "tsi",
+    "form",
+    "experience",
+    "specialty_index",
+)
+FIELDS = ("id", "name", *INT_FIELDS)
+
+# Column of the parsed HO! export (``parse_ho_csv`` / ``parse_ho_paste``) for
+# each integer field.
+HO_COLUMNS = {
+    "age_years": "AgeYears",
+    "age_days": "AgeDays",
+    "playmaking": "Playmaking",
+    "passing": "Passing",
+    "defending": "Defending",
+    "scoring": "Scoring",
+    "winger": "Winger",
+    "goalkeeping": "Goalkeeping",
+    "set_pieces": "SetPieces",
+    "stamina": "Stamina",
+    "tsi": "TSI",
+    "form": "Form",
+    "experience": "Experience",
+}
+
+# Goalkeeping and set pieces are left unknown (``None``) when a source lacks
+# them so the comparable filter does not match on them; everything else
+# defaults like the HO! export does.
+_DEFAULTS = {field: 0 for field in INT_FIELDS}
+_DEFAULTS.update(age_years=17, goalkeeping=None, set_pieces=None)
+
+
+def _to_int(value, default):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return default
+    return int(value)
+
+
+class Player:
+    """A single player's identity and pricing attributes."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, *, id=None, name: str = "(Player)", **attrs):
+        self.id = id
+        self.name = name
+        for field in INT_FIELDS:
+            setattr(self, field, attrs.pop(field, _DEFAULTS[field]))
+        if attrs:
+            raise TypeError(f"unknown player fields: {', '.join(sorted(attrs))}")
+
+    @classmethod
+    def from_ho_row(cls, row) -> "Player":
+        """Build from a row of ``parse_ho_csv`` (dict or Series)."""
+
+        attrs = {field: _to_int(row.get(col), _DEFAULTS[field]) for field, col in HO_COLUMNS.items()}
+        return cls(
+            name=str(row.get("Name", "(Player)")),
+            specialty_index=ho_specialty_to_index(row.get("Specialty", "None")),
+            **attrs,
+        )
+
+    @classmethod
+    def from_paste(cls, row: dict) -> "Player":
+        """Build from the dict returned by ``parse_ho_paste``."""
+
+        return cls.from_ho_row(row)
+
+    @classmethod
+    def from_chpp(cls, player) -> "Player":
+        """Build from a pyCHPP player object."""
+
+        def attr(name, default=None):
+            return getattr(player, name, default)
+
+        name = f"{attr('first_name', '') or ''} {attr('last_name', '') or ''}".strip() or attr("name", "(Player)")
+        return cls(
+            id=int(attr("id", 0)),
+            name=name,
+            age_years=int(attr("age", 17)),
+            specialty_index=int(attr("specialty", 0) or 0),
+            **{field: int(attr(field, 0)) for field in INT_FIELDS if field not in ("age_years", "specialty_index")},
+        )
+
+    @property
+    def specialty(self) -> str:
+        return SPECIALTY_NAMES[self.specialty_index] if 0 <= self.specialty_index < len(SPECIALTY_NAMES) else "None"
+
+    def get(self, key: str, default=None):
+        """Mapping-style access; unknown (``None``) values return ``default``."""
+
+        value = getattr(self, key, None) if key in FIELDS or key == "specialty" else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        if key not in FIELDS and key != "specialty":
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> dict:
+        return {**{field: getattr(self, field) for field in FIELDS}, "specialty": self.specialty}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Player):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Player(name={self.name!r}, age_years={self.age_years}, playmaking={self.playmaking}, tsi={self.tsi})"
+
+
+class PlayerBatch:
+    """Players stored column by column.
+
+    Integer fields are ``int64`` arrays, or ``None`` when the source has no
+    such column.  Iterating yields :class:`Player` records.
+    """
+
+    def __init__(self, names, columns: dict[str, np.ndarray | None], ids=None):
+        self.names = list(names)
+        self.ids = list(ids) if ids is not None else [None] * len(self.names)
+        self.columns = {field: columns.get(field) for field in INT_FIELDS}
+
+    @classmethod
+    def from_ho_frame(cls, df: pd.DataFrame) -> "PlayerBatch":
+        """Build from the frame returned by ``parse_ho_csv``."""
+
+        n = len(df)
+        columns = {}
+        for field, col in HO_COLUMNS.items():
+            default = _DEFAULTS[field]
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors="coerce")
+                columns[field] = values.fillna(default or 0).to_numpy(dtype=np.int64)
+            else:
+                columns[field] = None if default is None else np.full(n, default, dtype=np.int64)
+        if "Specialty" in df.columns:
+            specialty = df["Specialty"].fillna("None").astype(str)
+            index = {name: ho_specialty_to_index(name) for name in specialty.unique()}
+            columns["specialty_index"] = specialty.map(index).to_numpy(dtype=np.int64)
+        else:
+            columns["specialty_index"] = np.zeros(n, dtype=np.int64)
+        names = df["Name"].astype(str) if "Name" in df.columns else ["(Player)"] * n
+        return cls(names, columns)
+
+    @classmethod
+    def from_players(cls, players) -> "PlayerBatch":
+        """Build from :class:`Player` records or player dicts."""
+
+        players = list(players)
+        columns = {}
+        for field in INT_FIELDS:
+            values = [p.get(field) for p in players]
+            if all(v is None for v in values):
+                columns[field] = None
+            else:
+                default = _DEFAULTS[field] or 0
+                columns[field] = np.array([default if v is None else v for v in values], dtype=np.int64)
+        return cls([p.get("name", "(Player)") for p in players], columns, ids=[p.get("id") for p in players])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> Player:
+        attrs = {field: int(col[i]) for field, col in self.columns.items() if col is not None}
+        return Player(id=self.ids[i], name=self.names[i], **attrs)
+
+    def __iter__(self):
+        present = {field: col.tolist() for field, col in self.columns.items() if col is not None}
+        for i, (player_id, name) in enumerate(zip(self.ids, self.names)):
+            yield Player(id=player_id, name=name, **{field: values[i] for field, values in present.items()})
+
+    def take(self, indices) -> "PlayerBatch":
+        indices = np.asarray(indices, dtype=np.int64)
+        columns = {field: None if col is None else col[indices] for field, col in self.columns.items()}
+        return PlayerBatch([self.names[i] for i in indices], columns, ids=[self.ids[i] for i in indices])
+
+    def feature_matrix(self, features) -> np.ndarray:
+        """``len(self) x len(features)`` matrix; unknown columns are zero."""
+
+        out = np.zeros((len(self), len(features)), dtype=float)
+        for j, feature in enumerate(features):
+            col = self.columns.get(feature)
+            if col is not None:
+                out[:, j] = col
+        return out
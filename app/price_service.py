@@ -0,0 +1,286 @@
+"""Local HTTP pricing service.
+
+Usage::
+
+    python -m app.price_service --port 8765 --comps comps.csv
+
+Endpoints (JSON in, JSON out)::
+
+    POST /price        one player dict   -> prediction
+    POST /price/batch  list of players   -> list of predictions
+    GET  /stats        latency percentiles and batch-size histogram
+    GET  /health
+
+Concurrent ``/price`` requests arriving within ``--max-wait-ms`` of each other
+are coalesced into one :func:`pricing.predict_prices` call.
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# allow local imports when running from repo root
+sys.path.append(os.path.dirname(__file__))
+
+import pricing  # noqa: E402
+from market_store import read_comparables_csv  # noqa: E402
+from player import INT_FIELDS  # noqa: E402
+
+_STOP = object()
+
+
+def clean_player(payload: dict) -> dict:
+    """Copy of ``payload`` with its numeric player fields coerced to numbers.
+
+    Raises ``ValueError`` naming the first field that is not a finite number.
+    """
+
+    player = dict(payload)
+    for field in INT_FIELDS:
+        value = player.get(field)
+        if value is None:
+            continue
+        try:
+            if isinstance(value, bool):
+                raise ValueError
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a number, got {value!r}") from None
+        if not math.isfinite(number):
+            raise ValueError(f"{field} must be a finite number, got {value!r}")
+        player[field] = int(number) if number.is_integer() else number
+    return player
+
+
+class MicroBatcher:
+    """Coalesce single pricing requests into batched calls.
+
+    A background thread takes the first queued request, waits at most
+    ``max_wait_ms`` for more (up to ``max_batch``) and prices them together.
+    """
+
+    def __init__(self, price_many, *, max_batch: int = 64, max_wait_ms: float = 5.0, window: int = 10_000):
+        self.price_many = price_many
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes: Counter = Counter()
+        self._latencies: deque = deque(maxlen=window)
+        self._requests = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="price-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, player: dict) -> Future:
+        fut: Future = Future()
+        self._queue.put((player, fut, time.perf_counter()))
+        return fut
+
+    def price(self, player: dict, timeout: float | None = 30.0) -> dict:
+        return self.submit(player).result(timeout)
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch) -> None:
+        try:
+            outcomes = [(True, r) for r in self.price_many([player for player, _, _ in batch])]
+        except Exception as e:
+            if len(batch) == 1:
+                outcomes = [(False, e)]
+            else:
+                # Re-price one by one so a bad player only fails its own request.
+                outcomes = [self._price_one(player) for player, _, _ in batch]
+        done = time.perf_counter()
+        with self._lock:
+            self.batch_sizes[len(batch)] += 1
+            self._requests += len(batch)
+            self._latencies.extend(done - started for _, _, started in batch)
+        for (_, fut, _), (ok, value) in zip(batch, outcomes):
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(value)
+
+    def _price_one(self, player) -> tuple[bool, object]:
+        try:
+            return True, self.price_many([player])[0]
+        except Exception as e:
+            return False, e
+
+    def record(self, size: int, latency: float) -> None:
+        """Account for a request priced outside the queue (explicit batches)."""
+        with self._lock:
+            self.batch_sizes[size] += 1
+            self._requests += size
+            self._latencies.append(latency)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            sizes = dict(sorted(self.batch_sizes.items()))
+            requests = self._requests
+        if latencies.size:
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            latency = {"p50": p50, "p90": p90, "p99": p99, "max": latencies.max()}
+        else:
+            latency = {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "requests": requests,
+            "batches": sum(sizes.values()),
+            "latency_ms": {k: round(float(v), 3) for k, v in latency.items()},
+            "batch_sizes": {str(k): v for k, v in sizes.items()},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: "PriceService"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence per-request logging
+        pass
+
+    def _send(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send(200, self.service.batcher.stats())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path not in ("/price", "/price/batch"):
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            self._send(400, {"error": "invalid JSON"})
+            return
+        if self.path == "/price" and not isinstance(payload, dict):
+            self._send(400, {"error": "expected a player object"})
+            return
+        if self.path == "/price/batch" and (not isinstance(payload, list)
+                                            or not all(isinstance(p, dict) for p in payload)):
+            self._send(400, {"error": "expected a list of player objects"})
+            return
+        try:
+            if self.path == "/price":
+                payload = clean_player(payload)
+            else:
+                payload = [clean_player(p) for p in payload]
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        try:
+            if self.path == "/price":
+                self._send(200, self.service.batcher.price(payload))
+            else:
+                started = time.perf_counter()
+                results = self.service.price_many(payload)
+                self.service.batcher.record(len(payload), time.perf_counter() - started)
+                self._send(200, results)
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+
+class PriceService:
+    """Threaded HTTP server keeping models and comparables warm."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, comps=None, max_batch: int = 64,
+                 max_wait_ms: float = 5.0):
+        self.comps = comps
+        self.batcher = MicroBatcher(self.price_many, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        handler = type("Handler", (_Handler,), {"service": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def price_many(self, players: list[dict]) -> list[dict]:
+        return pricing.predict_prices(players, self.comps)
+
+    def warm_up(self) -> None:
+        pricing.warm_up(background=False)
+
+    def start(self) -> "PriceService":
+        self.warm_up()
+        self._thread = threading.Thread(target=self.server.serve_forever, name="price-service", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="price_service", description="Serve price predictions over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--comps", help="comparables CSV with prices")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    comps = read_comparables_csv(args.comps) if args.comps else None
+    service = PriceService(args.host, args.port, comps=comps, max_batch=args.max_batch,
+                           max_wait_ms=args.max_wait_ms).start()
+    print(f"Serving prices on {service.url}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,17 @@
 import json
 import os
+import threading
 
 import numpy as np
 import pandas as pd
 
 import pricing_model
+import shared_store
+from instrumentation import count, span
 
 _MODEL = None
 _GK_MODEL = None
+_MODEL_LOCK = threading.Lock()
 
 
 # Scaling factors for each attribute used when comparing two players.
@@ -101,56 +105,124 @@ def _age_price_curve(age_years: float) -> float:
     return float(factor / 0.9532287752233033)
 
 
+def _load_shared(name: str, model_path, loader):
+    """Attach a model exported to the host-wide shared store, if configured."""
+
+    store = shared_store.default_store()
+    if store is None:
+        return loader()
+    version = pricing_model.model_version(model_path)
+    if version.endswith(":untrained"):
+        loader()
+        version = pricing_model.model_version(model_path)
+    return shared_store.shared_model(store, name, version, loader)
+
+
 def _get_model():
     global _MODEL
     if _MODEL is None:
-        _MODEL = pricing_model.load_model()
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                with span("pricing.model_load"):
+                    _MODEL = _load_shared("pricing_model", pricing_model.MODEL_PATH, pricing_model.load_model)
     return _MODEL
 
 
 def _get_gk_model():
     global _GK_MODEL
     if _GK_MODEL is None:
-        _GK_MODEL = pricing_model.load_model_gk()
+        with _MODEL_LOCK:
+            if _GK_MODEL is None:
+                with span("pricing.model_load"):
+                    _GK_MODEL = _load_shared("pricing_model_gk", pricing_model.MODEL_PATH_GK, pricing_model.load_model_gk)
     return _GK_MODEL
 
 
+def warm_up(background: bool = True) -> threading.Thread | None:
+    """Load both fallback models ahead of the first prediction.
+
+    With ``background`` the models are loaded (or trained) in a daemon thread
+    so callers such as the UI can render first; a prediction arriving earlier
+    simply waits for the load in progress.
+    """
+
+    def load():
+        _get_model()
+        _get_gk_model()
+
+    if not background:
+        load()
+        return None
+    thread = threading.Thread(target=load, name="pricing-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def iqr_price_bounds(prices) -> tuple[float, float]:
+    """Return the ``(low, high)`` limits of 1.5 times the interquartile range."""
+
+    prices = pd.Series(prices, dtype=float)
+    q1 = prices.quantile(0.25)
+    q3 = prices.quantile(0.75)
+    iqr = q3 - q1
+    return float(q1 - 1.5 * iqr), float(q3 + 1.5 * iqr)
+
+
 def _filter_comparables(
     player: dict,
     comp_df: pd.DataFrame,
     *,
     age_range: float = 1.0,
     skill_delta: int = 1,
+    price_bounds: tuple[float, float] | None = None,
 ) -> pd.DataFrame:
     """Filter comparables by price outliers, age and skill levels.
 
     Prices outside 1.5 times the interquartile range are discarded. Only
     players within ``age_range`` years of the target player's age and whose
-    core skills differ by at most ``skill_delta`` levels are kept.
+    core skills differ by at most ``skill_delta`` levels are kept.  When
+    ``comp_df`` is a pre-filtered subset of a larger market, ``price_bounds``
+    carries the outlier limits computed over the full market.
     """
 
-    df = comp_df.copy()
+    mask = _comparables_mask(player, comp_df, age_range=age_range, skill_delta=skill_delta,
+                             price_bounds=price_bounds)
+    return comp_df[mask]
+
+
+def _comparables_mask(
+    player: dict,
+    comp_df: pd.DataFrame,
+    *,
+    age_range: float = 1.0,
+    skill_delta: int = 1,
+    price_bounds: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """Boolean row mask behind :func:`_filter_comparables`; copies nothing."""
+
+    mask = np.ones(len(comp_df), dtype=bool)
+    if comp_df.empty:
+        return mask
 
-    if not df.empty and "price" in df.columns:
-        q1 = df["price"].quantile(0.25)
-        q3 = df["price"].quantile(0.75)
-        iqr = q3 - q1
-        low = q1 - 1.5 * iqr
-        high = q3 + 1.5 * iqr
-        df = df[(df["price"] >= low) & (df["price"] <= high)]
+    if "price" in comp_df.columns:
+        if price_bounds is None:
+            price_bounds = iqr_price_bounds(comp_df["price"])
+        low, high = price_bounds
+        price = comp_df["price"].to_numpy(dtype=float)
+        mask &= (price >= low) & (price <= high)
 
     player_age = player.get("age_years")
     if player_age is None and (age_days := player.get("age_days")) is not None:
         player_age = age_days / 365
     if player_age is not None:
-        if "age_years" in df.columns:
-            comp_age = df["age_years"]
-        elif "age_days" in df.columns:
-            comp_age = df["age_days"] / 365
+        if "age_years" in comp_df.columns:
+            comp_age = comp_df["age_years"].to_numpy(dtype=float)
+        elif "age_days" in comp_df.columns:
+            comp_age = comp_df["age_days"].to_numpy(dtype=float) / 365
         else:
             comp_age = None
         if comp_age is not None:
-            df = df[(comp_age >= player_age - age_range) & (comp_age <= player_age + age_range)]
+            mask &= (comp_age >= player_age - age_range) & (comp_age <= player_age + age_range)
 
     skill_cols = [
         "playmaking",
@@ -162,36 +234,41 @@ def _filter_comparables(
     ]
     for col in skill_cols:
         p_val = player.get(col)
-        if p_val is not None and col in df.columns:
-            df = df[(df[col] >= p_val - skill_delta) & (df[col] <= p_val + skill_delta)]
+        if p_val is not None and col in comp_df.columns:
+            values = comp_df[col].to_numpy(dtype=float)
+            mask &= (values >= p_val - skill_delta) & (values <= p_val + skill_delta)
 
-    return df
+    return mask
 
 
-def predict_price_from_comparables(
+def _is_goalkeeper(player) -> bool:
+    return player.get("goalkeeping", 0) >= 7
+
+
+def _estimate_from_market(
     player,
     comp_df: pd.DataFrame | None,
     *,
-    min_comps: int = 3,
-    weights: dict[str, float] | None = None,
-    scales: dict[str, float] | None = None,
-):
-    """Predict price using either comparables or the trained model.
-
-    If a DataFrame of comparables is provided, their prices are weighted by
-    the inverse of the scaled, weighted distance to the target player.  The
-    comparable DataFrame is first filtered for outlier prices and players with
-    similar age and skill levels.  A minimum of ``min_comps`` valid comparables
-    is required; otherwise the machine learning model is used.  The weighting
-    parameters can be overridden via the ``weights`` and ``scales`` arguments or
-    by setting the ``PRICING_WEIGHTS`` and ``PRICING_SCALES`` environment
-    variables with JSON mappings.
-    """
-
-    is_gk = player.get("goalkeeping", 0) >= 7
+    min_comps: int,
+    weights: dict[str, float] | None,
+    scales: dict[str, float] | None,
+    store,
+    market_index,
+) -> dict | None:
+    """Price from comparables or the market index, ``None`` if too few."""
+
+    is_gk = _is_goalkeeper(player)
+
+    price_bounds = None
+    if comp_df is None and store is not None:
+        with span("pricing.store_query") as s:
+            comp_df = store.candidates(player)
+            price_bounds = store.price_bounds()
+            s.rows = len(comp_df)
 
     if comp_df is not None and not comp_df.empty:
-        comp_df = _filter_comparables(player, comp_df)
+        with span("pricing.filter", rows=len(comp_df)):
+            comp_df = _filter_comparables(player, comp_df, price_bounds=price_bounds)
         if len(comp_df) >= min_comps:
             default_w = GOALKEEPER_WEIGHTS if is_gk else DEFAULT_WEIGHTS
             default_s = GOALKEEPER_SCALES if is_gk else DEFAULT_SCALES
@@ -204,9 +281,11 @@ def predict_price_from_comparables(
                 **_load_config("PRICING_SCALES"),
             }
 
-            df = comp_df.copy()
-            df["distance"] = df.apply(lambda r: _distance(player, r, weights, scales), axis=1)
-            df["w"] = 1 / (1 + df["distance"])
+            with span("pricing.distance", rows=len(comp_df)):
+                df = comp_df.copy()
+                df["distance"] = df.apply(lambda r: _distance(player, r, weights, scales), axis=1)
+                df["w"] = 1 / (1 + df["distance"])
+            count("pricing.comparables_path")
 
             price_pred = float(np.average(df["price"], weights=df["w"]))
             p25 = float(np.percentile(df["price"], 25))
@@ -223,15 +302,31 @@ def predict_price_from_comparables(
                 "confidence": confidence,
             }
 
-    # Fall back to machine learning model when no comparables are provided.
-    model = _get_gk_model() if is_gk else _get_model()
-    price_pred = pricing_model.predict_gk(player, model) if is_gk else pricing_model.predict(player, model)
+    if market_index is not None:
+        prior = market_index.lookup(player)
+        if prior is not None and prior["count"] >= min_comps:
+            count("pricing.market_index_path")
+            return {
+                "price_pred": prior["median"],
+                "p25": prior["p25"],
+                "p75": prior["p75"],
+                "p05": prior["p05"],
+                "p95": prior["p95"],
+                "confidence": 0.5 * prior["count"] / (prior["count"] + min_comps),
+            }
+
+    return None
+
+
+def _model_estimate(player, price_pred: float) -> dict:
+    """Apply the age curve and fixed bands to a raw model prediction."""
 
     age_days = player.get("age_days")
     age_years = player.get("age_years")
     if age_years is None and age_days is not None:
         age_years = age_days / 365
-    age_factor = _age_price_curve(age_years) if age_years is not None else 1.0
+    with span("pricing.age_curve"):
+        age_factor = _age_price_curve(age_years) if age_years is not None else 1.0
 
     price_pred *= age_factor
     p25 = price_pred * 0.8
@@ -248,3 +343,106 @@ def predict_price_from_comparables(
         "p95": float(p95),
         "confidence": confidence,
     }
+
+
+def predict_price_from_comparables(
+    player,
+    comp_df: pd.DataFrame | None,
+    *,
+    min_comps: int = 3,
+    weights: dict[str, float] | None = None,
+    scales: dict[str, float] | None = None,
+    store=None,
+    market_index=None,
+):
+    """Predict price using either comparables or the trained model.
+
+    If a DataFrame of comparables is provided, their prices are weighted by
+    the inverse of the scaled, weighted distance to the target player.  The
+    comparable DataFrame is first filtered for outlier prices and players with
+    similar age and skill levels.  A minimum of ``min_comps`` valid comparables
+    is required; otherwise the machine learning model is used.  The weighting
+    parameters can be overridden via the ``weights`` and ``scales`` arguments or
+    by setting the ``PRICING_WEIGHTS`` and ``PRICING_SCALES`` environment
+    variables with JSON mappings.
+
+    Instead of a DataFrame, a :class:`market_store.MarketStore` can be passed
+    as ``store``; only the candidates matching the age and skill filters are
+    then loaded through an indexed query.
+
+    When too few comparables remain and a
+    :class:`market_index.MarketPriceIndex` is given, the price distribution of
+    the player's age band and primary-skill level serves as a cheap prior
+    before falling back to the model.
+    """
+
+    result = _estimate_from_market(
+        player,
+        comp_df,
+        min_comps=min_comps,
+        weights=weights,
+        scales=scales,
+        store=store,
+        market_index=market_index,
+    )
+    if result is not None:
+        return result
+
+    # Fall back to machine learning model when no comparables are provided.
+    is_gk = _is_goalkeeper(player)
+    model = _get_gk_model() if is_gk else _get_model()
+    count("pricing.model_path")
+    with span("pricing.model_predict", rows=1):
+        price_pred = pricing_model.predict_gk(player, model) if is_gk else pricing_model.predict(player, model)
+    return _model_estimate(player, price_pred)
+
+
+def predict_prices(
+    players,
+    comp_df: pd.DataFrame | None = None,
+    *,
+    min_comps: int = 3,
+    weights: dict[str, float] | None = None,
+    scales: dict[str, float] | None = None,
+    store=None,
+    market_index=None,
+) -> list[dict]:
+    """Batch version of :func:`predict_price_from_comparables`.
+
+    Players without enough comparables are priced with a single model call
+    per model instead of one call per player.  ``players`` may be a
+    :class:`player.PlayerBatch`, whose feature matrix then feeds the model
+    directly.
+    """
+
+    columnar = players if hasattr(players, "take") else None
+    players = list(players)
+    results: list[dict | None] = [None] * len(players)
+    pending: dict[bool, list[int]] = {False: [], True: []}
+    for i, player in enumerate(players):
+        results[i] = _estimate_from_market(
+            player,
+            comp_df,
+            min_comps=min_comps,
+            weights=weights,
+            scales=scales,
+            store=store,
+            market_index=market_index,
+        )
+        if results[i] is None:
+            pending[_is_goalkeeper(player)].append(i)
+
+    for is_gk, idx in pending.items():
+        if not idx:
+            continue
+        batch = columnar.take(idx) if columnar is not None else [players[i] for i in idx]
+        model = _get_gk_model() if is_gk else _get_model()
+        count("pricing.model_path", len(idx))
+        with span("pricing.model_predict", rows=len(idx)):
+            if is_gk:
+                prices = pricing_model.predict_many_gk(batch, model)
+            else:
+                prices = pricing_model.predict_many(batch, model)
+        for i, price in zip(idx, prices):
+            results[i] = _model_estimate(players[i], float(price))
+    return results
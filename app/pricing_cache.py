@@ -0,0 +1,278 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+import pricing
+import pricing_model
+from instrumentation import count
+
+# Player attributes that influence a prediction, either through the
+# comparable filter, the distance weighting or the model fallback.
+KEY_FEATURES = tuple(sorted({*pricing.DEFAULT_SCALES, "age_years"}))
+
+
+def _normalise_value(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def player_key(player) -> tuple:
+    """Return a hashable tuple of the player's pricing-relevant features."""
+
+    return tuple(_normalise_value(player.get(feat)) for feat in KEY_FEATURES)
+
+
+def comparables_fingerprint(comp_df: pd.DataFrame | None) -> str:
+    """Return a content hash of a comparables pool (empty for no pool)."""
+
+    if comp_df is None or comp_df.empty:
+        return ""
+    h = hashlib.sha1()
+    h.update("|".join(map(str, comp_df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(comp_df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def _config_key(config: dict[str, float] | None, env_var: str) -> tuple:
+    if not config:
+        # Mirror ``predict_price_from_comparables``: environment overrides only
+        # apply when no explicit mapping is passed.
+        config = pricing._load_config(env_var)
+        return ("env", tuple(sorted(config.items())))
+    return ("arg", tuple(sorted((k, float(v)) for k, v in config.items())))
+
+
+class PredictionCache:
+    """LRU cache with optional time-to-live for price predictions.
+
+    Entries are keyed on the player's normalised features, a fingerprint of the
+    comparables pool, the weighting configuration and the model version so a
+    stale prediction is never served after any of them change.  All methods
+    are safe to call from concurrent session threads.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return dict(value)
+
+    def put(self, key, value: dict) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), dict(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            stats = {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": hits,
+                "misses": misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+        lookups = hits + misses
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        return stats
+
+    def save(self, path: Path) -> None:
+        """Persist the cache entries to ``path``."""
+
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with self._lock:
+            items = list(self._data.items())
+        with open(tmp, "wb") as f:
+            pickle.dump(items, f)
+        os.replace(tmp, path)
+
+    def load(self, path: Path) -> int:
+        """Load entries saved with :meth:`save`, skipping expired ones."""
+
+        path = Path(path)
+        if not path.exists():
+            return 0
+        try:
+            with open(path, "rb") as f:
+                items = pickle.load(f)
+        except Exception:
+            return 0
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for key, (stored_at, value) in items:
+                if self.ttl is not None and now - stored_at > self.ttl:
+                    continue
+                self._data[key] = (stored_at, value)
+                self._data.move_to_end(key)
+                loaded += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return loaded
+
+
+_DEFAULT_CACHE = PredictionCache(
+    maxsize=int(os.getenv("PRICING_CACHE_SIZE", "4096")),
+    ttl=float(os.environ["PRICING_CACHE_TTL"]) if os.getenv("PRICING_CACHE_TTL") else None,
+)
+if os.getenv("PRICING_CACHE_PATH"):
+    _DEFAULT_CACHE.load(Path(os.environ["PRICING_CACHE_PATH"]))
+
+
+def default_cache() -> PredictionCache:
+    return _DEFAULT_CACHE
+
+
+def save_default_cache() -> None:
+    """Persist the default cache when ``PRICING_CACHE_PATH`` is set."""
+
+    if os.getenv("PRICING_CACHE_PATH"):
+        _DEFAULT_CACHE.save(Path(os.environ["PRICING_CACHE_PATH"]))
+
+
+def prediction_key(
+    player,
+    comp_df: pd.DataFrame | None,
+    *,
+    min_comps: int = 3,
+    weights: dict[str, float] | None = None,
+    scales: dict[str, float] | None = None,
+    comps_fingerprint: str | None = None,
+) -> tuple:
+    if comps_fingerprint is None:
+        comps_fingerprint = comparables_fingerprint(comp_df)
+    return (
+        player_key(player),
+        comps_fingerprint,
+        min_comps,
+        _config_key(weights, "PRICING_WEIGHTS"),
+        _config_key(scales, "PRICING_SCALES"),
+        pricing_model.model_version(),
+    )
+
+
+def predict_price_cached(
+    player,
+    comp_df: pd.DataFrame | None,
+    *,
+    min_comps: int = 3,
+    weights: dict[str, float] | None = None,
+    scales: dict[str, float] | None = None,
+    cache: PredictionCache | None = None,
+    comps_fingerprint: str | None = None,
+    store=None,
+) -> dict:
+    """Memoised :func:`pricing.predict_price_from_comparables`.
+
+    ``comps_fingerprint`` may be passed when pricing many players against the
+    same pool to avoid rehashing the comparables for every call.
+    """
+
+    cache = cache if cache is not None else _DEFAULT_CACHE
+    if comp_df is None and store is not None:
+        comps_fingerprint = store.fingerprint()
+    key = prediction_key(
+        player,
+        comp_df,
+        min_comps=min_comps,
+        weights=weights,
+        scales=scales,
+        comps_fingerprint=comps_fingerprint,
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        count("pricing_cache.hit")
+        return cached
+    count("pricing_cache.miss")
+    result = pricing.predict_price_from_comparables(
+        player, comp_df, min_comps=min_comps, weights=weights, scales=scales, store=store
+    )
+    cache.put(key, result)
+    return result
+
+
+def predict_prices_cached(
+    players,
+    comp_df: pd.DataFrame | None,
+    *,
+    min_comps: int = 3,
+    weights: dict[str, float] | None = None,
+    scales: dict[str, float] | None = None,
+    cache: PredictionCache | None = None,
+    comps_fingerprint: str | None = None,
+    store=None,
+) -> list[dict]:
+    """Memoised :func:`pricing.predict_prices`.
+
+    Cached players are answered from ``cache``; the misses are priced together
+    in one :func:`pricing.predict_prices` call (a :class:`player.PlayerBatch`
+    is sliced with ``take`` so the model gets its feature matrix directly).
+    """
+
+    cache = cache if cache is not None else _DEFAULT_CACHE
+    if comp_df is None and store is not None:
+        comps_fingerprint = store.fingerprint()
+    elif comps_fingerprint is None:
+        comps_fingerprint = comparables_fingerprint(comp_df)
+    batch = players if hasattr(players, "take") else None
+    players = list(players)
+    keys = [
+        prediction_key(p, comp_df, min_comps=min_comps, weights=weights, scales=scales,
+                       comps_fingerprint=comps_fingerprint)
+        for p in players
+    ]
+    results: list[dict | None] = [cache.get(key) for key in keys]
+    misses = [i for i, result in enumerate(results) if result is None]
+    if len(misses) < len(players):
+        count("pricing_cache.hit", len(players) - len(misses))
+    if misses:
+        count("pricing_cache.miss", len(misses))
+        todo = batch.take(misses) if batch is not None else [players[i] for i in misses]
+        priced = pricing.predict_prices(todo, comp_df, min_comps=min_comps, weights=weights, scales=scales,
+                                        store=store)
+        for i, result in zip(misses, priced):
+            cache.put(keys[i], result)
+            results[i] = result
+    return results
@@ -1,8 +1,17 @@
+from __future__ import annotations
+
 import pandas as pd
 import numpy as np
 import pickle
 from pathlib import Path
-from sklearn.tree import DecisionTreeRegressor
+from typing import TYPE_CHECKING
+
+from instrumentation import span
+
+if TYPE_CHECKING:
+    # scikit-learn takes over a second to import; it is only needed to fit
+    # a tree (unpickling imports it on demand).
+    from sklearn.tree import DecisionTreeRegressor
 
 FEATURES = ["playmaking", "passing", "defending", "scoring", "winger", "form", "tsi", "age_days", "specialty_index"]
 FEATURES_GK = FEATURES + ["goalkeeping", "set_pieces"]
@@ -11,13 +20,24 @@ DATA_PATH = BASE_DIR.parent / "data" / "player_sales.csv"
 MODEL_PATH = BASE_DIR / "pricing_model.pkl"
 MODEL_PATH_GK = BASE_DIR / "pricing_model_gk.pkl"
 
+def fit_model(df: pd.DataFrame, goalkeeper: bool = False) -> DecisionTreeRegressor:
+    """Fit a pricing tree on a sales frame without persisting it."""
+    from sklearn.tree import DecisionTreeRegressor
+
+    features = FEATURES_GK if goalkeeper else FEATURES
+    X = df.reindex(columns=features, fill_value=0)
+    model = DecisionTreeRegressor(random_state=0)
+    with span("pricing_model.train", rows=len(df)):
+        model.fit(X, df["price"])
+    return model
+
+
 def train_model(data_path: Path = DATA_PATH, model_path: Path = MODEL_PATH) -> DecisionTreeRegressor:
     """Train a pricing model and persist it to disk."""
-    df = pd.read_csv(data_path)
-    X = df[FEATURES]
-    y = df["price"]
-    model = DecisionTreeRegressor(random_state=0)
-    model.fit(X, y)
+    with span("pricing_model.read_sales") as s:
+        df = pd.read_csv(data_path)
+        s.rows = len(df)
+    model = fit_model(df)
     with open(model_path, "wb") as f:
         pickle.dump(model, f)
     return model
@@ -26,20 +46,15 @@ def load_model(model_path: Path = MODEL_PATH) -> DecisionTreeRegressor:
     """Load the pricing model from disk, training it if necessary."""
     if not model_path.exists():
         return train_model(model_path=model_path)
-    with open(model_path, "rb") as f:
+    with span("pricing_model.unpickle"), open(model_path, "rb") as f:
         return pickle.load(f)
 
 
 def train_model_gk(data_path: Path = DATA_PATH, model_path: Path = MODEL_PATH_GK) -> DecisionTreeRegressor:
-    df = pd.read_csv(data_path)
-    if "goalkeeping" not in df:
-        df["goalkeeping"] = 0
-    if "set_pieces" not in df:
-        df["set_pieces"] = 0
-    X = df[FEATURES_GK]
-    y = df["price"]
-    model = DecisionTreeRegressor(random_state=0)
-    model.fit(X, y)
+    with span("pricing_model.read_sales") as s:
+        df = pd.read_csv(data_path)
+        s.rows = len(df)
+    model = fit_model(df, goalkeeper=True)
     with open(model_path, "wb") as f:
         pickle.dump(model, f)
     return model
@@ -48,9 +63,22 @@ def train_model_gk(data_path: Path = DATA_PATH, model_path: Path = MODEL_PATH_GK
 def load_model_gk(model_path: Path = MODEL_PATH_GK) -> DecisionTreeRegressor:
     if not model_path.exists():
         return train_model_gk(model_path=model_path)
-    with open(model_path, "rb") as f:
+    with span("pricing_model.unpickle"), open(model_path, "rb") as f:
         return pickle.load(f)
 
+def model_version(*model_paths: Path) -> str:
+    """Return a token that changes whenever a persisted model is retrained."""
+    parts = []
+    for path in model_paths or (MODEL_PATH, MODEL_PATH_GK):
+        path = Path(path)
+        if path.exists():
+            st = path.stat()
+            parts.append(f"{path.name}:{st.st_mtime_ns}:{st.st_size}")
+        else:
+            parts.append(f"{path.name}:untrained")
+    return "|".join(parts)
+
+
 def predict(player: dict, model: DecisionTreeRegressor | None = None) -> float:
     """Predict the price for a player dict."""
     if model is None:
@@ -64,3 +92,23 @@ def predict_gk(player: dict, model: DecisionTreeRegressor | None = None) -> floa
         model = load_model_gk()
     x = np.array([[player.get(feat, 0) for feat in FEATURES_GK]])
     return float(model.predict(x)[0])
+
+
+def _feature_matrix(players, features: list[str]) -> np.ndarray:
+    # A ``player.PlayerBatch`` builds the matrix from its columns directly.
+    if hasattr(players, "feature_matrix"):
+        return players.feature_matrix(features)
+    return np.array([[player.get(feat, 0) for feat in features] for player in players])
+
+
+def predict_many(players, model: DecisionTreeRegressor | None = None) -> np.ndarray:
+    """Predict prices for several players with a single model call."""
+    if model is None:
+        model = load_model()
+    return model.predict(_feature_matrix(players, FEATURES))
+
+
+def predict_many_gk(players, model: DecisionTreeRegressor | None = None) -> np.ndarray:
+    if model is None:
+        model = load_model_gk()
+    return model.predict(_feature_matrix(players, FEATURES_GK))
@@ -1,6 +1,20 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import count
 from dateutil import tz, relativedelta
 
+# Fallback peak expiry windows as (weekday, hour, minute) in the market's
+# timezone, used until peaks are learned from sale deadlines (peak_slots).
+PEAK_WINDOWS = [(5, 15, 45), (2, 15, 45)]
+
+@lru_cache(maxsize=None)
+def get_tz(tzname:str):
+    """Cached ``tz.gettz``; timezone objects are immutable and reusable."""
+    tzinfo = tz.gettz(tzname)
+    if tzinfo is None:
+        raise ValueError(f"unknown timezone {tzname!r}")
+    return tzinfo
+
 def next_weekday(target_weekday:int, now_dt, hour:int, minute:int):
     days_ahead = (target_weekday - now_dt.weekday()) % 7
     candidate = now_dt + relativedelta.relativedelta(days=days_ahead)
@@ -9,12 +23,59 @@ def next_weekday(target_weekday:int, now_dt, hour:int, minute:int):
         candidate += relativedelta.relativedelta(days=7)
     return candidate
 
-def recommend_expiry_slots(tzname="America/Santiago", sat_hm=(15,45), wed_hm=(15,45)):
-    tzinfo = tz.gettz(tzname)
-    now = datetime.now(tz=tzinfo)
+def recommend_expiry_slots(tzname="America/Santiago", sat_hm=(15,45), wed_hm=(15,45), now=None, *,
+                           peaks=None, player=None, k=3):
+    """Next Saturday/Wednesday expiries, plus learned windows when available.
+
+    With a ``peak_slots.PeakSlotHistogram`` as ``peaks``, ``top_windows``
+    lists the next occurrence of the ``k`` best slots for ``player``'s
+    segment, each with its ``expiry`` and historical ``premium``.
+    """
+    tzinfo = get_tz(tzname)
+    now = now or datetime.now(tz=tzinfo)
     sat_expiry = next_weekday(5, now, sat_hm[0], sat_hm[1])
     wed_expiry = next_weekday(2, now, wed_hm[0], wed_hm[1])
-    return {"sat_expiry": sat_expiry, "wed_expiry": wed_expiry}
+    slots = {"sat_expiry": sat_expiry, "wed_expiry": wed_expiry}
+    if peaks is not None:
+        slots["top_windows"] = [
+            {**w, "expiry": next_weekday(w["weekday"], now, w["hour"], w["minute"])}
+            for w in peaks.top_windows(player, k)
+        ]
+    return slots
+
+def peak_windows(peaks=None, player=None, k=2):
+    """``(weekday, hour, minute)`` of the best learned windows, else ``PEAK_WINDOWS``."""
+    learned = peaks.top_windows(player, k) if peaks is not None else []
+    return [(w["weekday"], w["hour"], w["minute"]) for w in learned] or list(PEAK_WINDOWS)
 
 def compute_publish_time(expiry_dt, hours_before=72):
     return expiry_dt - relativedelta.relativedelta(hours=hours_before)
+
+def iter_expiry_slots(tzname="America/Santiago", windows=None, *, per_window=10, stagger_minutes=3, now=None):
+    """Yield staggered expiry times across the peak windows, earliest first.
+
+    Each window occurrence holds ``per_window`` expiries ``stagger_minutes``
+    apart starting at the window time; occurrences repeat weekly.
+    """
+    tzinfo = get_tz(tzname)
+    now = now or datetime.now(tz=tzinfo)
+    firsts = sorted(next_weekday(wd, now, h, m) for wd, h, m in (windows or PEAK_WINDOWS))
+    for week in count():
+        for first in firsts:
+            start = first + relativedelta.relativedelta(weeks=week)
+            for i in range(per_window):
+                yield start + timedelta(minutes=i * stagger_minutes)
+
+def plan_auctions(listings, tzname="America/Santiago", windows=None, *, per_window=10, stagger_minutes=3,
+                  hours_before=72, now=None):
+    """Assign every listing an expiry slot and publish time in one pass.
+
+    ``listings`` are dicts with at least a ``name``; they get slots in order,
+    so pass the most valuable players first to give them the earliest peaks.
+    Returns the listings extended with ``expiry`` and ``publish`` datetimes.
+    """
+    slots = iter_expiry_slots(tzname, windows, per_window=per_window, stagger_minutes=stagger_minutes, now=now)
+    return [
+        {**listing, "expiry": expiry, "publish": compute_publish_time(expiry, hours_before)}
+        for listing, expiry in zip(listings, slots)
+    ]
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Arrays are published as ``.npy`` files and attached with ``mmap_mode="r"``:
+# every process on the host maps the same pages from the OS page cache, so the
+# data is loaded once per host rather than once per session or worker.
+
+_TREE_ARRAYS = ["children_left", "children_right", "feature", "threshold", "value"]
+
+
+class SharedArrayStore:
+    """Directory of read-only, memory-mapped array bundles.
+
+    A bundle is a set of named arrays plus JSON metadata.  Publishing writes
+    the bundle into a content-addressed folder and then atomically swaps a
+    small pointer file, so readers never observe a half-written bundle.
+    Bundles no pointer references any more are deleted; processes that
+    already mapped them keep their pages until they unmap them.
+    """
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _pointer(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+
+    def publish(self, name: str, arrays: dict[str, np.ndarray], meta: dict | None = None) -> str:
+        digest = hashlib.sha1()
+        for key in sorted(arrays):
+            arr = np.ascontiguousarray(arrays[key])
+            digest.update(key.encode("utf-8"))
+            digest.update(str(arr.dtype).encode("utf-8"))
+            digest.update(repr(arr.shape).encode("utf-8"))
+            digest.update(arr.tobytes())
+        version = digest.hexdigest()[:16]
+        bundle = self.directory / f"{name}-{version}"
+        if not bundle.exists():
+            tmp = Path(tempfile.mkdtemp(dir=self.directory, prefix=f".{name}-"))
+            for key, arr in arrays.items():
+                np.save(tmp / f"{key}.npy", np.ascontiguousarray(arr), allow_pickle=False)
+            try:
+                os.rename(tmp, bundle)
+            except OSError:
+                # Another process published the same content first.
+                shutil.rmtree(tmp, ignore_errors=True)
+        pointer = {"bundle": bundle.name, "arrays": sorted(arrays), "meta": meta or {}}
+        fd, tmp_ptr = tempfile.mkstemp(dir=self.directory, prefix=f".{name}-", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(pointer, f)
+        os.replace(tmp_ptr, self._pointer(name))
+        self._remove_bundles(name, keep=bundle.name)
+        return version
+
+    def _remove_bundles(self, name: str, keep: str | None = None) -> None:
+        pattern = re.compile(re.escape(name) + r"-[0-9a-f]{16}")
+        for path in self.directory.iterdir():
+            if path.name != keep and pattern.fullmatch(path.name):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def prune(self, prefix: str, keep: int) -> list[str]:
+        """Delete all but the ``keep`` most recently published ``prefix*`` bundles.
+
+        Returns the names removed.
+        """
+
+        pointers = sorted(self.directory.glob(f"{prefix}*.json"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        removed = []
+        for pointer in pointers[keep:]:
+            name = pointer.name[:-len(".json")]
+            pointer.unlink(missing_ok=True)
+            self._remove_bundles(name)
+            removed.append(name)
+        return removed
+
+    def remove(self, name: str) -> None:
+        """Delete bundle ``name`` and its pointer."""
+
+        self._pointer(name).unlink(missing_ok=True)
+        self._remove_bundles(name)
+
+    def attach(self, name: str) -> tuple[dict[str, np.ndarray], dict] | None:
+        """Map a published bundle read-only, or return ``None``."""
+
+        # A concurrent publish may delete the bundle between reading the
+        # pointer and mapping it; the pointer then names a newer one.
+        for _ in range(3):
+            try:
+                with open(self._pointer(name)) as f:
+                    pointer = json.load(f)
+                bundle = self.directory / pointer["bundle"]
+                arrays = {key: np.load(bundle / f"{key}.npy", mmap_mode="r") for key in pointer["arrays"]}
+            except (OSError, ValueError, KeyError):
+                continue
+            return arrays, pointer["meta"]
+        return None
+
+
+class SharedTreeModel:
+    """Decision tree evaluated from exported, memory-mapped node arrays.
+
+    Mirrors ``DecisionTreeRegressor.predict`` for single-output trees.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], meta: dict | None = None):
+        self.children_left = arrays["children_left"]
+        self.children_right = arrays["children_right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.meta = meta or {}
+
+    def predict(self, X) -> np.ndarray:
+        # sklearn compares float32 features against float64 thresholds.
+        X = np.asarray(X, dtype=np.float32)
+        node = np.zeros(len(X), dtype=np.int64)
+        rows = np.arange(len(X))
+        active = self.children_left[node] != -1
+        while active.any():
+            idx = rows[active]
+            n = node[idx]
+            go_left = X[idx, self.feature[n]] <= self.threshold[n]
+            node[idx] = np.where(go_left, self.children_left[n], self.children_right[n])
+            active = self.children_left[node] != -1
+        return np.asarray(self.value[node, 0, 0], dtype=float)
+
+
+def export_tree(model) -> dict[str, np.ndarray]:
+    """Return the node arrays of a fitted ``DecisionTreeRegressor``."""
+
+    tree = model.tree_
+    return {key: np.asarray(getattr(tree, key)) for key in _TREE_ARRAYS}
+
+
+def shared_model(store: SharedArrayStore, name: str, version: str, loader) -> SharedTreeModel:
+    """Attach model ``name`` at ``version``, publishing it via ``loader()`` if needed."""
+
+    attached = store.attach(name)
+    if attached is None or attached[1].get("version") != version:
+        store.publish(name, export_tree(loader()), {"version": version})
+        attached = store.attach(name)
+    return SharedTreeModel(*attached)
+
+
+def share_frame(store: SharedArrayStore, df: pd.DataFrame, name: str = "comparables") -> pd.DataFrame:
+    """Publish ``df`` and return a view backed by the shared arrays.
+
+    Numeric, boolean and datetime columns are shared zero-copy.  Text
+    columns such as ids or deadlines are stored as integer codes plus their
+    distinct values and rebuilt on attach, so sale identity survives.
+    """
+
+    arrays, text, tz = {}, {}, {}
+    for i, col in enumerate(df.columns):
+        key, values = f"c{i}", df[col]
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            tz[key] = str(values.dt.tz)
+            arrays[key] = values.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+        elif isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+            arrays[key] = values.to_numpy()
+        elif pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            arrays[key] = values.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            codes, uniques = pd.factorize(values)
+            arrays[key] = codes.astype(np.int32)
+            text[key] = {"dtype": str(values.dtype), "values": [str(u) for u in uniques]}
+    store.publish(name, arrays, {"columns": list(map(str, df.columns)), "text": text, "tz": tz})
+    shared = attach_frame(store, name)
+    return shared if shared is not None else df
+
+
+def attach_frame(store: SharedArrayStore, name: str = "comparables") -> pd.DataFrame | None:
+    attached = store.attach(name)
+    if attached is None:
+        return None
+    arrays, meta = attached
+    text, tz = meta.get("text", {}), meta.get("tz", {})
+    data = {}
+    for i, col in enumerate(meta["columns"]):
+        key = f"c{i}"
+        values = np.asarray(arrays[key])
+        if key in text:
+            codes = values
+            uniques = np.array(text[key]["values"], dtype=object)
+            out = np.full(len(codes), None, dtype=object)
+            present = codes >= 0
+            out[present] = uniques[codes[present]]
+            data[col] = pd.Series(out, dtype=object).astype(text[key]["dtype"])
+        elif key in tz:
+            data[col] = pd.Series(values).dt.tz_localize("UTC").dt.tz_convert(tz[key])
+        else:
+            data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def default_store() -> SharedArrayStore | None:
+    """Store configured through ``HT_SHARED_DIR``, if any."""
+
+    path = os.getenv("HT_SHARED_DIR")
+    return SharedArrayStore(path) if path else None
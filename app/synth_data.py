@@ -0,0 +1,240 @@
+"""Seeded synthetic market data for scale testing.
+
+Usage::
+
+    python -m app.synth_data sales sales_1m.csv --rows 1000000 --seed 1
+    python -m app.synth_data ho squad.csv --rows 50000 --spanish
+
+Distributions follow ``data/player_sales.csv``: core skills, form, TSI, age
+and specialty are roughly uniform over the sample's ranges and log-price is
+linear in the skills and TSI with ~17% noise.  The sample contains no
+goalkeepers, so ``gk_share`` defaults to ``0``.  Rows are generated and written
+in chunks, so memory stays flat regardless of ``--rows``.
+"""
+import argparse
+import sys
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+# Log-price model fitted on data/player_sales.csv.
+_INTERCEPT = 13.287
+_COEF = {
+    "playmaking": 0.2367,
+    "passing": 0.0291,
+    "defending": 0.0274,
+    "scoring": 0.0213,
+    "winger": 0.0259,
+    "form": 0.0129,
+    "tsi": 6.9e-5,
+    "age_days": -9e-6,
+    "specialty_index": 0.0018,
+}
+_GK_COEF = 0.2367
+_NOISE_SD = 0.17
+
+# Auctions ending in the Saturday afternoon window sell for a small premium.
+_PEAK_WEEKDAY = 5
+_PEAK_MINUTE = 15 * 60 + 45
+_PEAK_SHARE = 0.3
+_PEAK_PREMIUM = 0.08
+
+SPECIALTIES = ["None", "Technical", "Quick", "Unpredictable", "Powerful", "Head"]
+SPECIALTIES_ES = ["Ninguna", "Técnico", "Rápido", "Impredecible", "Potente", "Cabezazo"]
+
+HO_COLUMNS = {
+    "Name": "Nombre",
+    "Age": "Edad",
+    "AgeDays": "EdadDías",
+    "TSI": "TSI",
+    "Form": "Forma",
+    "Experience": "Experiencia",
+    "Specialty": "Especialidad",
+    "Playmaking": "Jugadas",
+    "Passing": "Pases",
+    "Defending": "Defensa",
+    "Scoring": "Anotación",
+    "Winger": "Extremo",
+    "Stamina": "Resistencia",
+    "Goalkeeping": "Portería",
+    "Set Pieces": "Balón Parado",
+}
+
+
+# Rows are drawn in fixed blocks, each with its own generator derived from the
+# seed, so the data only depends on the seed and not on ``chunk_size``.
+_BLOCK = 8_192
+
+
+def _chunks(n: int, seed: int, chunk_size: int, make_block) -> Iterator[pd.DataFrame]:
+    pending: list[pd.DataFrame] = []
+    buffered = 0
+    for block, start in enumerate(range(0, n, _BLOCK)):
+        rng = np.random.default_rng([seed, block])
+        pending.append(make_block(rng, start, min(_BLOCK, n - start)))
+        buffered += len(pending[-1])
+        while buffered >= chunk_size or (start + _BLOCK >= n and buffered):
+            frame = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+            yield frame.iloc[:chunk_size].reset_index(drop=True)
+            rest = frame.iloc[chunk_size:]
+            pending = [rest] if len(rest) else []
+            buffered = len(rest)
+
+
+def _players(rng: np.random.Generator, n: int, gk_share: float) -> pd.DataFrame:
+    gk = rng.random(n) < gk_share
+    df = pd.DataFrame({
+        "playmaking": np.where(gk, rng.integers(0, 4, n), rng.integers(4, 12, n)),
+        "passing": np.where(gk, rng.integers(0, 3, n), rng.integers(0, 8, n)),
+        "defending": np.where(gk, rng.integers(0, 4, n), rng.integers(0, 8, n)),
+        "scoring": np.where(gk, 0, rng.integers(0, 8, n)),
+        "winger": np.where(gk, 0, rng.integers(0, 8, n)),
+        "form": rng.integers(4, 9, n),
+        "tsi": rng.integers(1_100, 19_900, n),
+        "age_days": rng.integers(4_000, 15_800, n),
+        "specialty_index": rng.integers(0, 6, n),
+        "goalkeeping": np.where(gk, rng.integers(6, 13, n), rng.integers(0, 3, n)),
+        "set_pieces": rng.integers(0, 9, n),
+    })
+    return df
+
+
+def _log_price(df: pd.DataFrame, rng: np.random.Generator) -> np.ndarray:
+    log_price = np.full(len(df), _INTERCEPT)
+    for col, coef in _COEF.items():
+        log_price += coef * df[col].to_numpy()
+    # Goalkeepers are priced on goalkeeping the way field players are on
+    # playmaking.
+    gk = df["goalkeeping"].to_numpy() >= 6
+    log_price += np.where(gk, _GK_COEF * df["goalkeeping"].to_numpy() + 1.0, 0.0)
+    return log_price + rng.normal(0, _NOISE_SD, len(df))
+
+
+def _deadlines(rng: np.random.Generator, n: int, end: pd.Timestamp, weeks: int) -> tuple[pd.Series, np.ndarray]:
+    week_start = (end - pd.Timedelta(weeks=weeks)).normalize()
+    week_start -= pd.Timedelta(days=week_start.weekday())
+    week = rng.integers(0, weeks, n)
+    peak = rng.random(n) < _PEAK_SHARE
+    weekday = np.where(peak, _PEAK_WEEKDAY, rng.integers(0, 7, n))
+    minute = np.where(peak, _PEAK_MINUTE + 15 * rng.integers(-2, 3, n), rng.integers(0, 96, n) * 15)
+    offsets = pd.to_timedelta(week * 7 + weekday, unit="D") + pd.to_timedelta(minute, unit="min")
+    return pd.Series(week_start + offsets), peak
+
+
+def generate_sales(
+    n: int,
+    *,
+    seed: int = 0,
+    gk_share: float = 0.0,
+    weeks: int = 26,
+    end: str | pd.Timestamp | None = None,
+    chunk_size: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Yield chunks of synthetic sales (the ``player_sales.csv`` schema).
+
+    Besides the model features each sale carries ``goalkeeping``,
+    ``set_pieces``, a ``player_id`` and an auction ``deadline`` spread over the
+    last ``weeks`` weeks before ``end``.
+    """
+
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp("2024-06-30")
+
+    def make_block(rng, start, size):
+        df = _players(rng, size, gk_share)
+        log_price = _log_price(df, rng)
+        deadlines, peak = _deadlines(rng, size, end, weeks)
+        log_price += np.where(peak, np.log1p(_PEAK_PREMIUM), 0.0)
+        df.insert(0, "price", np.exp(log_price).round(2))
+        df["player_id"] = np.arange(start, start + size) + 100_000_000
+        df["deadline"] = deadlines.dt.strftime("%Y-%m-%d %H:%M").to_numpy()
+        return df
+
+    return _chunks(n, seed, chunk_size, make_block)
+
+
+def generate_ho_players(
+    n: int,
+    *,
+    seed: int = 0,
+    gk_share: float = 0.0,
+    spanish: bool = False,
+    chunk_size: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Yield chunks of an HO! player export as read by ``parse_ho_csv``."""
+
+    names = SPECIALTIES_ES if spanish else SPECIALTIES
+
+    def make_block(rng, start, size):
+        df = _players(rng, size, gk_share)
+        ho = pd.DataFrame({
+            "Name": [f"Player {i}" for i in range(start, start + size)],
+            "Age": df["age_days"] // 365,
+            "AgeDays": rng.integers(0, 112, size),
+            "TSI": df["tsi"],
+            "Form": df["form"],
+            "Experience": rng.integers(0, 10, size),
+            "Specialty": np.asarray(names, dtype=object)[df["specialty_index"].to_numpy()],
+            "Playmaking": df["playmaking"],
+            "Passing": df["passing"],
+            "Defending": df["defending"],
+            "Scoring": df["scoring"],
+            "Winger": df["winger"],
+            "Stamina": rng.integers(3, 9, size),
+            "Goalkeeping": df["goalkeeping"],
+            "Set Pieces": df["set_pieces"],
+        })
+        return ho.rename(columns=HO_COLUMNS) if spanish else ho
+
+    return _chunks(n, seed, chunk_size, make_block)
+
+
+def _write_chunks(chunks: Iterator[pd.DataFrame], target, sep: str = ",") -> int:
+    rows = 0
+    own = not hasattr(target, "write")
+    fp = open(target, "w", newline="", encoding="utf-8") if own else target
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(fp, sep=sep, header=i == 0, index=False)
+            rows += len(chunk)
+    finally:
+        if own:
+            fp.close()
+    return rows
+
+
+def write_sales_csv(target, n: int, **kwargs) -> int:
+    """Stream ``n`` synthetic sales to a path or text file object."""
+
+    return _write_chunks(generate_sales(n, **kwargs), target)
+
+
+def write_ho_csv(target, n: int, *, sep: str = ",", **kwargs) -> int:
+    """Stream an ``n`` player HO! export to a path or text file object."""
+
+    return _write_chunks(generate_ho_players(n, **kwargs), target, sep=sep)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="synth_data", description="Generate synthetic market data.")
+    parser.add_argument("kind", choices=["sales", "ho"])
+    parser.add_argument("output", help="output CSV path, or '-' for stdout")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gk-share", type=float, default=0.0)
+    parser.add_argument("--spanish", action="store_true", help="Spanish HO! headers (ho only)")
+    parser.add_argument("--sep", default=None, help="field separator (default ',' or ';' for --spanish)")
+    args = parser.parse_args(argv)
+
+    target = sys.stdout if args.output == "-" else args.output
+    if args.kind == "sales":
+        rows = write_sales_csv(target, args.rows, seed=args.seed, gk_share=args.gk_share)
+    else:
+        sep = args.sep or (";" if args.spanish else ",")
+        rows = write_ho_csv(target, args.rows, sep=sep, seed=args.seed, gk_share=args.gk_share, spanish=args.spanish)
+    print(f"wrote {rows} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@ import streamlit as st
 import re
 import pandas as pd
 
+from export import export_frame, format_for_path, mime_type
+
 def themed_header(title, subtitle=""):
     st.markdown(f"<div style='display:flex;align-items:flex-end;gap:12px'><h1 style='margin-bottom:0'>{title}</h1><span style='opacity:0.7'>{subtitle}</span></div>", unsafe_allow_html=True)
 
@@ -32,6 +34,17 @@ def moneyfmt(x):
     except:
         return str(x)
 
-def df_download_button(df:pd.DataFrame, filename:str, label:str="⬇️ Download CSV"):
-    csv = df.to_csv(index=False)
-    st.download_button(label, data=csv, file_name=filename, mime="text/csv")
+def df_download_button(df:pd.DataFrame, filename:str, label:str="⬇️ Download CSV", fmt:str|None=None):
+    """Offer ``df`` for download, written in chunks to a spooled file; the
+    format (CSV, gzipped CSV, JSON lines, Parquet) follows ``filename``."""
+    fmt = fmt or format_for_path(filename)
+    export_download_button(export_frame(df, fmt), filename, label, fmt)
+
+def export_download_button(fp, filename:str, label:str, fmt:str="csv"):
+    """Serve a finished export file (see ``export.ExportWriter``).
+
+    Streamlit keeps download payloads in memory, so the file is read once as
+    bytes; no intermediate string copy of the table is made."""
+    with fp:
+        data = fp.read()
+    st.download_button(label, data=data, file_name=filename, mime=mime_type(fmt))
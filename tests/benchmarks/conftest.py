@@ -0,0 +1,76 @@
+"""Benchmark harness for the pricing and import hot paths.
+
+Benchmarks only run with ``HT_BENCH=1``::
+
+    HT_BENCH=1 pytest tests/benchmarks
+
+Each benchmark records its median wall time to ``bench_results.json`` (or
+``HT_BENCH_OUTPUT``) and fails when it is slower than the stored baseline in
+``baseline.json`` by more than ``HT_BENCH_TOLERANCE`` (default ``1.0``, i.e.
+twice as slow).  ``HT_BENCH_UPDATE=1`` rewrites the baseline instead.
+"""
+import json
+import os
+import pathlib
+import platform
+import statistics
+import time
+
+import pytest
+
+BASELINE_PATH = pathlib.Path(__file__).parent / "baseline.json"
+RESULTS_PATH = pathlib.Path(os.getenv("HT_BENCH_OUTPUT", "bench_results.json"))
+TOLERANCE = float(os.getenv("HT_BENCH_TOLERANCE", "1.0"))
+UPDATE = os.getenv("HT_BENCH_UPDATE", "") not in ("", "0")
+
+_RESULTS: dict[str, dict] = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("HT_BENCH", "") in ("", "0"):
+        skip = pytest.mark.skip(reason="benchmarks run with HT_BENCH=1")
+        for item in items:
+            if "benchmarks" in item.path.parts:
+                item.add_marker(skip)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _RESULTS:
+        return
+    payload = {"python": platform.python_version(), "machine": platform.machine(), "results": _RESULTS}
+    RESULTS_PATH.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    if UPDATE:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        baseline.update({name: round(res["median_s"], 6) for name, res in _RESULTS.items()})
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def bench():
+    """Time ``fn`` ``repeat`` times and check the median against the baseline."""
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+    def run(name: str, fn, *, repeat: int = 5, rows: int | None = None):
+        timings = []
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        _RESULTS[name] = {
+            "median_s": median,
+            "min_s": min(timings),
+            "repeat": repeat,
+            "rows": rows,
+            "rows_per_s": rows / median if rows and median else None,
+        }
+        expected = baseline.get(name)
+        if expected is not None and not UPDATE:
+            limit = expected * (1 + TOLERANCE)
+            assert median <= limit, f"{name}: {median:.4f}s exceeds baseline {expected:.4f}s (+{TOLERANCE:.0%})"
+        return result
+
+    return run
+
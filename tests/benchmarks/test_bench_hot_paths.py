@@ -0,0 +1,70 @@
+import io
+
+import pandas as pd
+import pytest
+
+import pricing
+import pricing_model
+import synth_data
+from ho_import import parse_ho_csv
+
+
+def make_market(n: int, seed: int = 0) -> pd.DataFrame:
+    return pd.concat(synth_data.generate_sales(n, seed=seed, gk_share=0.05), ignore_index=True)
+
+
+def make_ho_csv(n: int, seed: int = 0) -> str:
+    buf = io.StringIO()
+    synth_data.write_ho_csv(buf, n, seed=seed)
+    return buf.getvalue()
+
+
+PLAYER = {"playmaking": 8, "passing": 4, "defending": 3, "scoring": 4,
+          "winger": 3, "form": 6, "tsi": 9_000, "age_days": 9_500,
+          "specialty_index": 1}
+
+
+@pytest.mark.parametrize("n", [1_000, 100_000, 1_000_000])
+def test_single_player_with_comparables(bench, n):
+    comps = make_market(n)
+    bench(f"pricing.single_comparables_{n}", lambda: pricing.predict_price_from_comparables(PLAYER, comps),
+          repeat=3 if n >= 1_000_000 else 5, rows=n)
+
+
+def test_batch_1k_players(bench):
+    comps = make_market(10_000, seed=1)
+    players = make_market(1_000, seed=2).drop(columns=["price", "deadline"]).to_dict("records")
+    bench("pricing.batch_1k_players", lambda: pricing.predict_prices(players, comps), repeat=1, rows=1_000)
+
+
+def test_model_fallback(bench):
+    players = make_market(1_000, seed=3).drop(columns=["price", "deadline"]).to_dict("records")
+    pricing._get_model()
+    bench("pricing.model_fallback_single", lambda: pricing.predict_price_from_comparables(PLAYER, None),
+          repeat=20, rows=1)
+    bench("pricing.model_fallback_batch_1k", lambda: pricing.predict_prices(players, None), repeat=5, rows=1_000)
+
+
+def test_parse_ho_csv_100k(bench):
+    text = make_ho_csv(100_000)
+    df = bench("ho_import.parse_csv_100k", lambda: parse_ho_csv(text), repeat=1, rows=100_000)
+    assert len(df) == 100_000
+
+
+def test_train_model(bench, tmp_path):
+    n = len(pd.read_csv(pricing_model.DATA_PATH))
+    bench("pricing_model.train", lambda: pricing_model.train_model(model_path=tmp_path / "model.pkl"), rows=n)
+
+
+def test_peak_slot_lookup_1k_players(bench):
+    from peak_slots import PeakSlotHistogram
+
+    peaks = PeakSlotHistogram()
+    peaks.add(make_market(100_000, seed=3))
+    players = make_market(1_000, seed=4).to_dict("records")
+
+    def lookup():
+        peaks._cache.clear()
+        return [peaks.top_windows(p) for p in players]
+
+    bench("peak_slots.lookup_1k_players", lookup, rows=1_000)
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+import pytest
+
+import import_times
+
+FIRST_PREDICTION = (
+    "import sys; sys.path.insert(0, {app_dir!r}); import pricing; "
+    "pricing.predict_price_from_comparables({{'playmaking': 8, 'age_days': 9500}}, None)"
+)
+
+
+@pytest.mark.parametrize("module", ["pricing", "pricing_cache", "batch_pricer", "price_service"])
+def test_cold_import(bench, module):
+    bench(f"startup.import_{module}", lambda: import_times.measure(module, repeat=1), repeat=3)
+
+
+def test_cold_first_prediction(bench):
+    code = FIRST_PREDICTION.format(app_dir=str(import_times.APP_DIR))
+    bench("startup.first_prediction", lambda: subprocess.run([sys.executable, "-c", code], check=True), repeat=3)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest
+from synth_data import generate_sales
+
+
+def _sales(n=240, seed=0):
+    # A few archetypes repeated with price noise so every test player has
+    # enough comparables.
+    rng = np.random.default_rng(seed)
+    base = next(generate_sales(8, seed=seed))
+    df = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    df["price"] = df["price"] * rng.lognormal(0, 0.1, n)
+    df["deadline"] = pd.date_range("2024-01-01", periods=n, freq="h").strftime("%Y-%m-%d %H:%M")
+    return df
+
+
+def test_kfold_splits_partition_rows():
+    splits = backtest.kfold_splits(10, 3, seed=1)
+    tests = np.sort(np.concatenate([test for _, test in splits]))
+    assert tests.tolist() == list(range(10))
+    for train, test in splits:
+        assert not set(train) & set(test)
+        assert len(train) + len(test) == 10
+
+
+def test_time_splits_never_train_on_the_future():
+    sales = _sales(60).sample(frac=1, random_state=0).reset_index(drop=True)
+    deadlines = pd.to_datetime(sales["deadline"])
+    splits = backtest.time_splits(sales, 3)
+    assert len(splits) == 3
+    for train, test in splits:
+        assert deadlines[train].max() < deadlines[test].min()
+    with pytest.raises(ValueError):
+        backtest.time_splits(sales.drop(columns="deadline"), 3)
+
+
+def test_grid_configs_cover_every_combination():
+    configs = backtest.grid_configs({"tsi": [0.5, 2]}, {"age_days": [900, 1825, 3650]})
+    assert len(configs) == 6
+    assert configs[0]["weights"] == {"tsi": 0.5}
+    assert configs[0]["scales"] == {"age_days": 900.0}
+    assert len({c["name"] for c in configs}) == 6
+
+
+def test_run_backtest_reports_every_path():
+    report = backtest.run_backtest(_sales(), mode="time", splits=3)
+    assert report["path"].tolist() == list(backtest.PATHS)
+    assert (report["players"] == 180).all()
+    by_path = report.set_index("path")
+    assert 0 < by_path.loc["comparables", "priced"] <= 180
+    assert by_path.loc["combined", "priced"] == by_path.loc["model", "priced"] == 180
+    assert by_path.loc["comparables", "mape"] < 0.5
+    assert ((report["cover_90"] >= 0) & (report["cover_90"] <= 1)).all()
+    assert (report["players_per_s"] > 0).all()
+
+
+def test_grid_search_in_parallel_matches_serial():
+    kwargs = dict(weights_grid={"tsi": [0.1, 10]}, mode="kfold", splits=2, seed=3)
+    serial = backtest.grid_search(_sales(80), **kwargs)
+    parallel = backtest.grid_search(_sales(80), workers=2, **kwargs)
+    cols = ["config", "priced", "mape", "cover_50"]
+    pd.testing.assert_frame_equal(serial[cols], parallel[cols])
+    assert serial["mape"].is_monotonic_increasing
+
+
+def test_cli_prints_report(capsys, tmp_path):
+    path = tmp_path / "sales.csv"
+    _sales(60).to_csv(path, index=False)
+    out = tmp_path / "report.csv"
+    assert backtest.main([str(path), "--splits", "2", "-o", str(out)]) == 0
+    assert "combined" in capsys.readouterr().out
+    assert len(pd.read_csv(out)) == 3
+    assert backtest.main([str(tmp_path / "missing.csv")]) == 2
@@ -0,0 +1,105 @@
+import io
+import json
+import pathlib
+
+import batch_pricer
+
+SQUAD = pathlib.Path(__file__).parent / "data" / "goalkeeper_ho.csv"
+MARKET = pathlib.Path(__file__).parent.parent / "data" / "player_sales.csv"
+
+
+def _squad_text(n=5):
+    lines = SQUAD.read_text().splitlines()
+    rows = [lines[1].replace("GK Sample", f"Player {i}").replace(",8,6", f",{i % 9},6") for i in range(n)]
+    return "\n".join([lines[0], *rows]) + "\n"
+
+
+def _squad(tmp_path, n=5):
+    path = tmp_path / "squad.csv"
+    path.write_text(_squad_text(n))
+    return path
+
+
+def test_cli_writes_jsonl(tmp_path):
+    out = tmp_path / "pred.jsonl"
+    code = batch_pricer.main([str(_squad(tmp_path)), "--comps", str(MARKET), "-o", str(out)])
+    assert code == batch_pricer.EXIT_OK
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["Name"] for r in rows] == [f"Player {i}" for i in range(5)]
+    assert all(r["PriceExpected"] > 0 for r in rows)
+
+
+def test_cli_stdin_stdout_with_workers(tmp_path, monkeypatch, capsys):
+    squad = _squad(tmp_path, n=20)
+    monkeypatch.setattr("sys.stdin", io.StringIO(squad.read_text()))
+    assert batch_pricer.main(["-", "--workers", "2"]) == batch_pricer.EXIT_OK
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split(",") == batch_pricer.OUTPUT_COLUMNS
+    assert len(lines) == 21
+    assert lines[1].startswith("Player 0,")
+
+
+def test_cli_exit_codes(tmp_path):
+    assert batch_pricer.main([str(tmp_path / "missing.csv")]) == batch_pricer.EXIT_INPUT
+    assert batch_pricer.main([str(_squad(tmp_path)), "--workers", "0"]) == batch_pricer.EXIT_USAGE
+
+
+def test_cli_writes_gzipped_csv(tmp_path):
+    import gzip
+
+    out = tmp_path / "pred.csv.gz"
+    assert batch_pricer.main([str(_squad(tmp_path)), "-o", str(out)]) == batch_pricer.EXIT_OK
+    lines = gzip.decompress(out.read_bytes()).decode().splitlines()
+    assert lines[0].split(",") == batch_pricer.OUTPUT_COLUMNS
+    assert len(lines) == 6
+
+
+def test_iter_predictions_prices_in_chunks(monkeypatch):
+    import pandas as pd
+    import pricing
+    from ho_import import parse_ho_csv
+    from player import PlayerBatch
+
+    squad = PlayerBatch.from_ho_frame(parse_ho_csv(_squad_text(7)))
+    comps = pd.read_csv(MARKET)
+    expected = [batch_pricer.prediction_row(p, pricing.predict_price_from_comparables(p, comps)) for p in squad]
+
+    calls = []
+    real = batch_pricer.predict_prices
+
+    def spy(players, *args, **kwargs):
+        calls.append(len(players))
+        if len(calls) == 2:
+            raise ValueError("bad chunk")
+        return real(players, *args, **kwargs)
+
+    monkeypatch.setattr(batch_pricer, "predict_prices", spy)
+    rows = list(batch_pricer.iter_predictions(squad, comps, chunk_rows=3))
+    assert calls == [3, 3, 1]
+    assert [row for row, _ in rows] == expected
+    assert all(error is None for _, error in rows)
+
+
+def test_workers_attach_shared_comparables(tmp_path, monkeypatch):
+    import pandas as pd
+    from ho_import import parse_ho_csv
+    from player import PlayerBatch
+
+    squad = PlayerBatch.from_ho_frame(parse_ho_csv(_squad_text(8)))
+    comps = pd.read_csv(MARKET)
+    expected = list(batch_pricer.iter_predictions(squad, comps))
+
+    shared_dir = tmp_path / "shm"
+    monkeypatch.setenv("HT_SHARED_DIR", str(shared_dir))
+    seen = []
+    real_pool = batch_pricer.ProcessPoolExecutor
+
+    def pool(*args, **kwargs):
+        seen.append(kwargs["initargs"])
+        return real_pool(*args, **kwargs)
+
+    monkeypatch.setattr(batch_pricer, "ProcessPoolExecutor", pool)
+    assert list(batch_pricer.iter_predictions(squad, comps, workers=2)) == expected
+    comps_arg, _, shared = seen[0]
+    assert comps_arg is None and shared[0] == str(shared_dir)
+    assert list(shared_dir.iterdir()) == []
@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+import pytest
+import pricing
+import pricing_model
+from comps_watch import ComparablesDirectory
+
+
+def _write(path, df, mtime=None):
+    df.to_csv(path, index=False)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_incremental_refresh(tmp_path):
+    market = pd.read_csv(pricing_model.DATA_PATH)
+    a, b = market.iloc[:120], market.iloc[120:]
+    _write(tmp_path / "a.csv", a)
+    watcher = ComparablesDirectory(tmp_path)
+    assert watcher.refresh()["added"] == ["a.csv"]
+    assert len(watcher) == len(a)
+
+    _write(tmp_path / "b.csv", b)
+    report = watcher.refresh()
+    assert report["added"] == ["b.csv"] and not report["changed"]
+    assert watcher.price_bounds() == pytest.approx(pricing.iqr_price_bounds(market["price"]))
+
+    # Touching a file without changing its content does not re-ingest it.
+    _write(tmp_path / "a.csv", a, mtime=1_000_000_000)
+    assert watcher.refresh() == {"added": [], "changed": [], "removed": []}
+
+    _write(tmp_path / "a.csv", a.iloc[:50])
+    assert watcher.refresh()["changed"] == ["a.csv"]
+    expected = pd.concat([a.iloc[:50], b])
+    assert len(watcher) == len(expected)
+    assert watcher.price_bounds() == pytest.approx(pricing.iqr_price_bounds(expected["price"]))
+
+    (tmp_path / "b.csv").unlink()
+    assert watcher.refresh()["removed"] == ["b.csv"]
+    assert sorted(watcher.frame["price"]) == pytest.approx(sorted(a.iloc[:50]["price"]))
+
+
+def test_prediction_through_directory(tmp_path):
+    market = pd.read_csv(pricing_model.DATA_PATH)
+    _write(tmp_path / "snapshot.csv", market)
+    watcher = ComparablesDirectory(tmp_path)
+    watcher.refresh()
+    player = market.iloc[3].drop("price").to_dict()
+    expected = pricing.predict_price_from_comparables(player, market, min_comps=1)
+    result = pricing.predict_price_from_comparables(player, None, min_comps=1, store=watcher)
+    assert result == pytest.approx(expected)
+
+
+def test_pool_is_built_once_per_change(tmp_path):
+    market = pd.read_csv(pricing_model.DATA_PATH)
+    _write(tmp_path / "a.csv", market.iloc[:100])
+    watcher = ComparablesDirectory(tmp_path)
+    watcher.refresh()
+    pool = watcher.frame
+    player = market.iloc[3].drop("price").to_dict()
+    expected = pricing._filter_comparables(player, market.iloc[:100], price_bounds=(float("-inf"), float("inf")))
+    pd.testing.assert_frame_equal(watcher.candidates(player).reset_index(drop=True), expected.reset_index(drop=True))
+    assert watcher.frame is pool
+
+    _write(tmp_path / "b.csv", market.iloc[100:])
+    watcher.refresh()
+    assert watcher.frame is not pool
+    assert len(watcher.frame) == len(watcher) == len(market)
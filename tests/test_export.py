@@ -0,0 +1,55 @@
+import gzip
+import io
+import json
+
+import pandas as pd
+import pytest
+
+import export
+
+FRAME = pd.DataFrame({"Name": ["A", "B", "C"], "Price": [1000, 2500, 40], "Confidence": [0.5, 0.75, None]})
+
+
+def test_csv_matches_pandas_and_spools_to_disk():
+    fp = export.export_frame(FRAME, "csv", spool_bytes=16)
+    assert fp._rolled
+    assert fp.read().decode() == FRAME.to_csv(index=False)
+
+
+def test_rows_and_frames_can_be_mixed():
+    writer = export.ExportWriter("csv.gz", FRAME.columns)
+    writer.write({"Name": "first", "Price": 1, "Confidence": 0.1, "extra": "ignored"})
+    writer.write_frame(FRAME, chunk_rows=2)
+    assert writer.rows == 4
+    lines = gzip.decompress(writer.finish().read()).decode().splitlines()
+    assert lines == ["Name,Price,Confidence", "first,1,0.1", "A,1000,0.5", "B,2500,0.75", "C,40,"]
+
+
+def test_jsonl_to_external_target():
+    target = io.BytesIO()
+    writer = export.ExportWriter("jsonl", ["Name", "Price"], target)
+    writer.write({"Name": "x", "Price": 1})
+    writer.write_frame(FRAME)
+    assert writer.finish() is target
+    rows = [json.loads(line) for line in target.getvalue().decode().splitlines()]
+    assert rows == [{"Name": "x", "Price": 1}] + FRAME[["Name", "Price"]].to_dict("records")
+
+
+def test_format_helpers():
+    assert export.format_for_path("out/PRED.csv.gz") == "csv.gz"
+    assert export.format_for_path("pred.ndjson") == "jsonl"
+    assert export.format_for_path("-") == "csv"
+    assert export.mime_type("csv") == "text/csv"
+    assert {"csv", "csv.gz", "jsonl"} <= set(export.available_formats())
+    with pytest.raises(ValueError):
+        export.ExportWriter("xlsx", ["a"])
+
+
+def test_parquet_round_trip():
+    pytest.importorskip("pyarrow")
+    writer = export.ExportWriter("parquet", FRAME.columns, row_group_rows=2)
+    writer.write_rows(FRAME.to_dict("records"))
+    writer.write_frame(FRAME)
+    out = pd.read_parquet(writer.finish())
+    assert len(out) == 6
+    assert out["Name"].tolist() == ["A", "B", "C"] * 2
@@ -23,3 +23,34 @@ END:VEVENT
 END:VCALENDAR
 """
     assert ics_bytes.decode("utf-8") == expected
+
+
+def test_make_ics_multiple_events():
+    tzinfo = tz.gettz("America/Santiago")
+    start = datetime(2023, 1, 7, 15, 45, tzinfo=tzinfo)
+    events = [
+        {"title": "Expiry: Juan Pérez", "start": start, "description": "Publish Wed; expected $1.000.000"},
+        {"title": "Expiry: Juan Pérez", "start": start},
+        {"title": "Expiry: " + "x" * 120, "start": start},
+    ]
+    stamp = datetime(2023, 1, 1, tzinfo=tz.UTC)
+    text = ics_utils.make_ics(events, dtstamp=stamp).decode("utf-8")
+
+    lines = text.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2] == "END:VCALENDAR"
+    assert text.count("BEGIN:VEVENT") == 3
+    uids = [line for line in lines if line.startswith("UID:")]
+    assert len(set(uids)) == 3
+    assert r"DESCRIPTION:Publish Wed\; expected $1.000.000" in lines
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert "\r\n x" in text
+    assert ics_utils.make_ics(events, dtstamp=stamp).decode("utf-8") == text
+
+
+def test_write_ics_events_streams_to_file(tmp_path):
+    start = datetime(2023, 1, 7, 15, 45, tzinfo=tz.UTC)
+    path = tmp_path / "agenda.ics"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        n = ics_utils.write_ics_events(f, ({"title": f"P{i}", "start": start} for i in range(300)))
+    assert n == 300
+    assert path.read_text(encoding="utf-8").count("END:VEVENT") == 300
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import import_times
+
+
+def test_pricing_import_does_not_load_sklearn():
+    code = (f"import sys; sys.path.insert(0, {str(import_times.APP_DIR)!r}); import pricing_cache; "
+            "print('sklearn' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
+
+
+def test_measure_and_breakdown():
+    assert 0 < import_times.measure("instrumentation", repeat=1) < 5
+    rows = import_times.import_breakdown("scheduler", top=3)
+    assert rows[0][0] == "scheduler"
+    assert len(rows) == 3
+    assert all(cumulative >= own >= 0 for _, own, cumulative in rows)
+
+
+def test_cli_reports_unimportable_modules(capsys):
+    assert import_times.main(["features", "no_such_module", "--repeat", "1"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out.startswith("features")
+    assert "no_such_module" in captured.err
@@ -0,0 +1,68 @@
+import contextvars
+
+import instrumentation
+import pricing
+
+
+PLAYER = {"playmaking": 6, "passing": 3, "defending": 3, "scoring": 3,
+          "winger": 2, "form": 5, "tsi": 4000, "age_days": 9000,
+          "specialty_index": 0}
+
+
+def test_disabled_span_is_noop(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_ENABLED", False)
+    stats = instrumentation.Stats()
+    token = instrumentation.use(stats)
+    try:
+        with instrumentation.span("stage") as s:
+            s.rows = 3
+        instrumentation.count("event")
+    finally:
+        instrumentation._current.reset(token)
+    assert stats.snapshot() == {"stages": {}, "counters": {}}
+
+
+def test_pricing_stages_recorded(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_ENABLED", True)
+    stats = instrumentation.Stats()
+    token = instrumentation.use(stats)
+    try:
+        pricing.predict_price_from_comparables(PLAYER, None)
+    finally:
+        instrumentation._current.reset(token)
+
+    snap = stats.snapshot()
+    assert {"pricing.model_predict", "pricing.age_curve"} <= set(snap["stages"])
+    assert snap["stages"]["pricing.model_predict"]["rows"] == 1
+    assert snap["counters"]["pricing.model_path"] == 1
+
+    prom = stats.to_prometheus()
+    assert 'httrader_stage_calls_total{stage="pricing.model_predict"} 1' in prom
+    assert '# TYPE httrader_stage_seconds_total counter' in prom
+    assert '"pricing.age_curve"' in stats.to_json()
+
+
+def test_enable_only_affects_current_context(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_ENABLED", False)
+    seen = {}
+
+    def session(name, flag):
+        instrumentation.enable(flag)
+        stats = instrumentation.Stats()
+        instrumentation.use(stats)
+        with instrumentation.span("stage"):
+            pass
+        seen[name] = stats.snapshot()["stages"]
+
+    for name, flag in (("on", True), ("off", False)):
+        contextvars.copy_context().run(session, name, flag)
+    assert set(seen["on"]) == {"stage"}
+    assert seen["off"] == {}
+    assert not instrumentation.enabled()
+
+    monkeypatch.setattr(instrumentation, "_ENABLED", True)
+    assert instrumentation.enabled()
+    ctx = contextvars.copy_context()
+    ctx.run(instrumentation.enable, False)
+    assert ctx.run(instrumentation.enabled) is False
+    assert instrumentation.enabled()
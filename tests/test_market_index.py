@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+import pricing
+from market_index import MarketPriceIndex
+from market_store import MarketStore
+
+
+def _sales(prices, week_start, age_days=8000, playmaking=8):
+    return pd.DataFrame({
+        "price": prices,
+        "age_days": age_days,
+        "playmaking": playmaking,
+        "passing": 3,
+        "deadline": pd.Timestamp(week_start),
+    })
+
+
+def test_bucket_median_and_window_expiry():
+    index = MarketPriceIndex(window_weeks=2)
+    index.add(_sales([1_000_000, 2_000_000, 3_000_000], "2024-01-01"))
+    player = {"age_days": 8000, "playmaking": 8, "passing": 3}
+    stats = index.lookup(player)
+    assert stats["count"] == 3
+    assert stats["median"] == pytest.approx(2_000_000, rel=0.06)
+
+    index.add(_sales([10_000_000], "2024-01-08"))
+    assert index.lookup(player)["count"] == 4
+
+    # Two weeks later the first week falls out of the window.
+    index.add(_sales([10_000_000], "2024-01-15"))
+    assert index.lookup(player)["count"] == 2
+    assert index.lookup({"age_days": 8000, "playmaking": 12}) is None
+
+
+def test_market_index_prior():
+    index = MarketPriceIndex()
+    index.add(_sales([1_000_000] * 5, "2024-01-01"))
+    player = {"playmaking": 8, "passing": 3, "defending": 0, "scoring": 0,
+              "winger": 0, "form": 5, "tsi": 4000, "age_days": 8000,
+              "specialty_index": 0}
+    out = pricing.predict_price_from_comparables(player, None, market_index=index)
+    assert out["price_pred"] == pytest.approx(1_000_000, rel=0.06)
+    assert out["p05"] <= out["price_pred"] <= out["p95"]
+
+
+def test_add_skips_unpriced_and_ageless_sales():
+    index = MarketPriceIndex()
+    assert index.add(_sales([0.0], "2024-01-01")) == 0
+    assert index.add(_sales([float("nan")], "2024-01-01")) == 0
+    sales = _sales([1_000_000, 2_000_000], "2024-01-01").assign(age_days=[8000, None])
+    assert index.add(sales) == 1
+    assert len(index) == 1
+
+
+def test_store_sales_roll_by_deadline():
+    store = MarketStore()
+    store.ingest_frame(pd.concat([
+        _sales([1_000_000] * 3, "2024-01-01").assign(player_id=[1, 2, 3]),
+        _sales([2_000_000] * 2, "2024-02-19").assign(player_id=[4, 5]),
+    ]).astype({"deadline": str}))
+    index = MarketPriceIndex(window_weeks=4)
+    assert index.add_store(store) == 2
+    player = {"age_days": 8000, "playmaking": 8, "passing": 3}
+    # Only the February sales are inside the four-week window.
+    assert index.lookup(player)["count"] == 2
+
+    index.advance_to(pd.Timestamp("2024-03-25", tz="UTC"))
+    assert index.lookup(player) is None
+    assert len(index) == 0
@@ -0,0 +1,117 @@
+import io
+
+import pandas as pd
+import pytest
+import pricing
+import pricing_model
+from market_store import MarketStore, read_comparables_csv
+
+
+def _market():
+    return pd.read_csv(pricing_model.DATA_PATH)
+
+
+def test_ingest_dedupes_rows():
+    store = MarketStore()
+    df = _market()
+    assert store.ingest_frame(df) == len(df.drop_duplicates())
+    assert store.ingest_frame(df) == 0
+
+    ids = pd.DataFrame([
+        {"player_id": 1, "deadline": "2024-01-06", "price": 10.0, "age_days": 7000},
+        {"player_id": 1, "deadline": "2024-01-06", "price": 12.0, "age_days": 7000},
+        {"player_id": 1, "deadline": "2024-02-03", "price": 12.0, "age_days": 7000},
+    ])
+    assert store.ingest_frame(ids) == 2
+
+
+def test_price_bounds_match_pandas():
+    store = MarketStore()
+    df = _market()
+    store.ingest_frame(df)
+    low, high = store.price_bounds()
+    exp_low, exp_high = pricing.iqr_price_bounds(df.drop_duplicates()["price"])
+    assert abs(low - exp_low) < 1e-6 * abs(exp_low)
+    assert abs(high - exp_high) < 1e-6 * abs(exp_high)
+
+
+def test_store_prediction_matches_dataframe():
+    df = _market().drop_duplicates()
+    store = MarketStore()
+    store.ingest_frame(df)
+    player = df.iloc[0].drop("price").to_dict()
+
+    expected = pricing.predict_price_from_comparables(player, df, min_comps=1)
+    via_store = pricing.predict_price_from_comparables(player, None, min_comps=1, store=store)
+    for key, value in expected.items():
+        assert abs(via_store[key] - value) <= 1e-6 * max(1.0, abs(value))
+
+
+def test_ingest_semicolon_csv(tmp_path):
+    path = tmp_path / "comps.csv"
+    _market().head(10).to_csv(path, sep=";", index=False)
+    assert len(read_comparables_csv(path)) == 10
+
+    store = MarketStore(tmp_path / "market.sqlite")
+    assert store.ingest_csv(path, chunksize=3) == 10
+    store.close()
+    assert len(MarketStore(tmp_path / "market.sqlite")) == 10
+    assert len(read_comparables_csv(io.BytesIO(path.read_bytes()))) == 10
+
+
+def test_fingerprint_per_store_and_generation(tmp_path):
+    market = _market()
+    a, b = MarketStore(), MarketStore()
+    a.ingest_frame(market.iloc[:10])
+    b.ingest_frame(market.iloc[10:20])
+    assert len(a) == len(b) and a.fingerprint() != b.fingerprint()
+
+    before = a.fingerprint()
+    assert a.ingest_frame(market.iloc[:10]) == 0
+    assert a.fingerprint() == before
+    a.ingest_frame(market.iloc[20:21])
+    assert a.fingerprint() != before
+
+    path = tmp_path / "market.sqlite"
+    reader, writer = MarketStore(path), MarketStore(path)
+    seen = reader.fingerprint()
+    writer.ingest_frame(market.iloc[:5])
+    assert reader.fingerprint() != seen
+
+
+def test_to_frame_with_identity_columns():
+    store = MarketStore()
+    market = _market().head(5).assign(player_id=range(5), deadline="2024-03-30 15:45")
+    store.ingest_frame(market)
+    frame = store.to_frame(columns=["player_id", "deadline", "price"])
+    assert list(frame.columns) == ["player_id", "deadline", "price"]
+    assert frame["deadline"].eq("2024-03-30 15:45").all()
+    with pytest.raises(ValueError):
+        store.to_frame(columns=["price; DROP TABLE sales"])
+
+
+def test_caches_follow_other_connections(tmp_path):
+    market = _market()
+    path = tmp_path / "market.sqlite"
+    reader, writer = MarketStore(path), MarketStore(path)
+    reader.ingest_frame(market.iloc[:20][["price", "age_days"]])
+    stale = reader.price_bounds()
+    assert reader.columns() == ["price", "age_days"]
+
+    writer.ingest_frame(market)
+    assert reader.price_bounds() == MarketStore(path).price_bounds() != stale
+    assert "playmaking" in reader.columns()
+
+
+def test_file_fingerprint_survives_reopen(tmp_path):
+    market = _market()
+    path = tmp_path / "market.sqlite"
+    store = MarketStore(path)
+    store.ingest_frame(market.iloc[:10])
+    first = store.fingerprint()
+    store.close()
+
+    reopened = MarketStore(path)
+    assert reopened.fingerprint() == first
+    reopened.ingest_frame(market.iloc[10:12])
+    assert reopened.fingerprint() != first
@@ -0,0 +1,115 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from market_store import MarketStore
+from peak_slots import N_SLOTS, PeakSlotHistogram
+from synth_data import generate_sales
+
+PLAYER = {"age_days": 9_000, "playmaking": 8}
+
+
+def _sales(n=20_000, seed=1):
+    return pd.concat(generate_sales(n, seed=seed), ignore_index=True)
+
+
+def test_learns_saturday_afternoon_peak():
+    peaks = PeakSlotHistogram()
+    assert peaks.add(_sales()) == 20_000
+    best = peaks.top_windows(k=2)
+    assert [w["weekday"] for w in best] == [5, 5]
+    assert all(15 <= w["hour"] <= 16 for w in best)
+    assert all(w["premium"] > 0.03 for w in best)
+    assert abs(best[0]["hour"] * 60 + best[0]["minute"] - best[1]["hour"] * 60 - best[1]["minute"]) >= 60
+
+
+def test_incremental_adds_match_single_add():
+    sales = _sales(6_000)
+    whole = PeakSlotHistogram()
+    whole.add(sales)
+    chunked = PeakSlotHistogram()
+    for start in range(0, len(sales), 1_000):
+        chunked.add(sales.iloc[start:start + 1_000])
+    for player in (None, PLAYER):
+        np.testing.assert_allclose(chunked.premiums(player)[0], whole.premiums(player)[0], atol=1e-9)
+    assert len(chunked) == len(whole) == 6_000
+
+
+def test_segment_lookup_is_cached_until_next_add():
+    peaks = PeakSlotHistogram()
+    peaks.add(_sales(5_000))
+    first = peaks.top_windows(PLAYER)
+    assert peaks.top_windows(PLAYER) is first
+    assert all(w["samples"] <= 5_000 for w in first)
+    peaks.add(_sales(1_000, seed=2))
+    assert peaks.top_windows(PLAYER) is not first
+
+
+def test_timezones_and_missing_deadlines():
+    sales = pd.DataFrame({
+        "price": [1e6, 2e6, 3e6],
+        "age_days": [9_000] * 3,
+        "deadline": ["2024-06-01 18:45+00:00", "2024-06-01 19:45+00:00", "not a date"],
+    })
+    peaks = PeakSlotHistogram("America/Santiago")
+    assert peaks.add(sales) == 2
+    counts = peaks.premiums()[1]
+    assert counts.sum() == 2 and counts.shape == (N_SLOTS,)
+    # 18:45 UTC is 14:45 in Santiago (UTC-4) on a Saturday.
+    assert counts[5 * 96 + 14 * 4 + 3] == 1
+    assert PeakSlotHistogram().add(sales.drop(columns="deadline")) == 0
+    assert PeakSlotHistogram().top_windows() == []
+
+
+def test_offsets_across_dst_change_and_naive_deadlines():
+    sales = pd.DataFrame({
+        "price": [1e6, 2e6, 3e6],
+        "age_days": [9_000] * 3,
+        # Santiago leaves summer time (UTC-3 -> UTC-4) on 2024-04-07.
+        "deadline": ["2024-03-30 15:45-03:00", "2024-04-13 15:45-04:00", "2024-04-20 15:45"],
+    })
+    peaks = PeakSlotHistogram("America/Santiago")
+    assert peaks.add(sales) == 3
+    assert peaks.premiums()[1][5 * 96 + 15 * 4 + 3] == 3
+
+
+def test_seed_from_market_store():
+    sales = _sales(2_000)
+    store = MarketStore()
+    assert store.ingest_frame(sales) == 2_000
+    assert "deadline" not in store.to_frame().columns
+    peaks = PeakSlotHistogram()
+    assert peaks.add_store(store) == 2_000
+    direct = PeakSlotHistogram()
+    direct.add(sales)
+    np.testing.assert_array_equal(peaks.premiums()[1], direct.premiums()[1])
+
+
+def test_lookups_during_adds_never_cache_old_data():
+    peaks = PeakSlotHistogram()
+    peaks.add(_sales(2_000))
+    batches = [_sales(500, seed=s) for s in range(3, 9)]
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            peaks.top_windows(PLAYER)
+            peaks.premiums()
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    try:
+        for batch in batches:
+            peaks.add(batch)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    fresh = PeakSlotHistogram()
+    for df in [_sales(2_000), *batches]:
+        fresh.add(df)
+    np.testing.assert_allclose(peaks.premiums(PLAYER)[0], fresh.premiums(PLAYER)[0], atol=1e-9)
+    assert peaks.top_windows(PLAYER) == fresh.top_windows(PLAYER)
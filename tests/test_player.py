@@ -0,0 +1,73 @@
+import pathlib
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+
+import pricing
+import pricing_model
+from ho_import import parse_ho_csv, parse_ho_paste
+from player import Player, PlayerBatch
+from synth_data import write_ho_csv
+
+GK_CSV = pathlib.Path(__file__).parent / "data" / "goalkeeper_ho.csv"
+
+
+def _squad(n=50):
+    import io
+
+    buf = io.StringIO()
+    write_ho_csv(buf, n, seed=4, gk_share=0.2)
+    return parse_ho_csv(buf.getvalue())
+
+
+def test_from_ho_row_keeps_goalkeeping():
+    row = parse_ho_csv(GK_CSV.read_text()).iloc[0]
+    p = Player.from_ho_row(row)
+    assert (p.name, p.age_years, p.goalkeeping, p.set_pieces) == ("GK Sample", 19, 8, 6)
+    assert p.specialty == "None"
+    assert p.get("goalkeeping") == 8 and p["tsi"] == 1000
+    assert not hasattr(p, "__dict__")
+
+
+def test_from_paste_and_chpp():
+    p = Player.from_paste(parse_ho_paste("Nombre: X\nEdad: 18 años y 20 días\nJugadas: 7\nEspecialidad: Técnico"))
+    assert (p.name, p.age_years, p.age_days, p.playmaking, p.specialty) == ("X", 18, 20, 7, "Technical")
+
+    chpp = SimpleNamespace(id="12", first_name="Ana", last_name="Soto", age=20, playmaking=9, specialty=2)
+    p = Player.from_chpp(chpp)
+    assert (p.id, p.name, p.age_years, p.playmaking, p.specialty) == (12, "Ana Soto", 20, 9, "Quick")
+    assert p.to_dict()["goalkeeping"] == 0
+
+
+def test_unknown_values_behave_like_missing_keys():
+    p = Player(name="Field", playmaking=7)
+    assert p.goalkeeping is None
+    assert p.get("goalkeeping") is None
+    assert p.get("goalkeeping", 0) == 0
+    assert p.get("not_a_field", 1) == 1
+
+
+def test_batch_matches_rows_and_pickles():
+    squad = _squad()
+    batch = PlayerBatch.from_ho_frame(squad)
+    rows = [Player.from_ho_row(r) for _, r in squad.iterrows()]
+    assert list(batch) == rows
+    assert batch[3] == rows[3]
+    assert pickle.loads(pickle.dumps(rows[0])) == rows[0]
+    assert PlayerBatch.from_players(rows)[7] == rows[7]
+
+
+def test_feature_matrix_matches_per_player_loop():
+    batch = PlayerBatch.from_ho_frame(_squad())
+    for features in (pricing_model.FEATURES, pricing_model.FEATURES_GK):
+        expected = np.array([[p.get(f, 0) for f in features] for p in batch], dtype=float)
+        np.testing.assert_array_equal(batch.feature_matrix(features), expected)
+    sub = batch.take([5, 1])
+    assert [p.name for p in sub] == [batch.names[5], batch.names[1]]
+
+
+def test_predict_prices_accepts_batch():
+    batch = PlayerBatch.from_ho_frame(_squad(30))
+    expected = pricing.predict_prices(list(batch))
+    assert pricing.predict_prices(batch) == expected
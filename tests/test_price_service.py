@@ -0,0 +1,108 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pricing
+import pytest
+from price_service import MicroBatcher, PriceService
+
+PLAYERS = [
+    {"playmaking": pm, "passing": 3, "defending": 3, "scoring": 3, "winger": 2,
+     "form": 5, "tsi": 4000, "age_days": 9000, "specialty_index": 0}
+    for pm in range(4, 14)
+]
+
+
+def _post(url, payload):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.load(resp)
+
+
+def test_batcher_coalesces_requests():
+    calls = []
+
+    def price_many(players):
+        calls.append(len(players))
+        return [{"n": p["n"]} for p in players]
+
+    batcher = MicroBatcher(price_many, max_batch=8, max_wait_ms=200)
+    futures = [batcher.submit({"n": i}) for i in range(10)]
+    assert [f.result(5)["n"] for f in futures] == list(range(10))
+    batcher.close()
+    assert sum(calls) == 10
+    assert max(calls) > 1
+    stats = batcher.stats()
+    assert stats["requests"] == 10
+    assert stats["latency_ms"]["p50"] <= stats["latency_ms"]["p99"]
+
+
+def test_service_over_localhost():
+    service = PriceService(max_wait_ms=20).start()
+    try:
+        results = [None] * len(PLAYERS)
+
+        def worker(i):
+            results[i] = _post(service.url + "/price", PLAYERS[i])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(PLAYERS))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expected = [pricing.predict_price_from_comparables(p, None) for p in PLAYERS]
+        assert results == expected
+        assert _post(service.url + "/price/batch", PLAYERS[:3]) == expected[:3]
+
+        with urllib.request.urlopen(service.url + "/stats", timeout=10) as resp:
+            stats = json.load(resp)
+        assert stats["requests"] == len(PLAYERS) + 3
+        assert set(stats["latency_ms"]) == {"p50", "p90", "p99", "max"}
+
+        with pytest.raises(urllib.error.HTTPError) as err:
+            _post(service.url + "/price", [1, 2])
+        assert err.value.code == 400
+    finally:
+        service.stop()
+
+
+def test_batcher_isolates_failing_player():
+    def price_many(players):
+        return [{"price": float(p["playmaking"]) * 1000} for p in players]
+
+    batcher = MicroBatcher(price_many, max_batch=8, max_wait_ms=200)
+    good, bad = batcher.submit({"playmaking": 8}), batcher.submit({"playmaking": "eight"})
+    assert good.result(5) == {"price": 8000.0}
+    with pytest.raises(ValueError):
+        bad.result(5)
+    batcher.close()
+    assert batcher.stats()["requests"] == 2
+
+
+def test_service_rejects_bad_player_without_failing_others():
+    service = PriceService(max_wait_ms=50).start()
+    try:
+        good = {"playmaking": 8, "age_days": 8000, "tsi": 5000}
+        outcomes = {}
+
+        def worker(name, payload):
+            try:
+                outcomes[name] = _post(service.url + "/price", payload)
+            except urllib.error.HTTPError as e:
+                outcomes[name] = e.code
+
+        threads = [threading.Thread(target=worker, args=("good", good)),
+                   threading.Thread(target=worker, args=("bad", {"playmaking": "eight"}))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert outcomes["bad"] == 400
+        assert outcomes["good"] == pricing.predict_price_from_comparables(good, None)
+        assert _post(service.url + "/price", {**good, "tsi": "5000"}) == outcomes["good"]
+        with pytest.raises(urllib.error.HTTPError) as err:
+            _post(service.url + "/price/batch", [good, {"tsi": None, "form": "nan"}])
+        assert err.value.code == 400
+    finally:
+        service.stop()
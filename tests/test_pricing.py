@@ -39,3 +39,12 @@ def test_predict_price_with_extreme_comparables_fallback():
     result_none = pricing.predict_price_from_comparables(player, None)
     result_extreme = pricing.predict_price_from_comparables(player, comps)
     assert result_extreme == result_none
+
+
+def test_warm_up_loads_models_in_background(monkeypatch):
+    monkeypatch.setattr(pricing, "_MODEL", None)
+    monkeypatch.setattr(pricing, "_GK_MODEL", None)
+    thread = pricing.warm_up()
+    thread.join(30)
+    assert pricing._MODEL is not None and pricing._GK_MODEL is not None
+    assert pricing.warm_up(background=False) is None
@@ -0,0 +1,105 @@
+import threading
+
+import pandas as pd
+import pricing_cache
+
+
+PLAYER = {"playmaking": 6, "passing": 3, "defending": 3, "scoring": 3,
+          "winger": 2, "form": 5, "tsi": 4000, "age_days": 9000,
+          "specialty_index": 0}
+
+
+def test_cached_prediction_matches_and_hits():
+    cache = pricing_cache.PredictionCache(maxsize=8)
+    first = pricing_cache.predict_price_cached(PLAYER, None, cache=cache)
+    second = pricing_cache.predict_price_cached(dict(PLAYER), None, cache=cache)
+    assert first == second
+    stats = cache.stats()
+    assert stats["hits"] >= 1
+    assert stats["size"] >= 1
+
+
+def test_key_changes_with_comparables_and_weights():
+    comps = pd.DataFrame([{**PLAYER, "price": p} for p in (100, 110, 120)])
+    changed = comps.assign(price=comps["price"] * 2)
+    assert pricing_cache.comparables_fingerprint(comps) != pricing_cache.comparables_fingerprint(changed)
+
+    base = pricing_cache.prediction_key(PLAYER, comps)
+    weighted = pricing_cache.prediction_key(PLAYER, comps, weights={"tsi": 2.0})
+    assert base != weighted
+    assert base == pricing_cache.prediction_key({**PLAYER, "tsi": 4000.0}, comps.copy())
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(pricing_cache.time, "time", lambda: clock[0])
+    cache = pricing_cache.PredictionCache(maxsize=2, ttl=10)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    clock[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_persist_round_trip(tmp_path):
+    cache = pricing_cache.PredictionCache()
+    cache.put(("k", 1), {"price_pred": 1.0})
+    path = tmp_path / "cache.pkl"
+    cache.save(path)
+
+    restored = pricing_cache.PredictionCache()
+    assert restored.load(path) == 1
+    assert restored.get(("k", 1)) == {"price_pred": 1.0}
+
+
+def test_concurrent_get_put_with_eviction_and_expiry():
+    cache = pricing_cache.PredictionCache(maxsize=8, ttl=0.0)
+    errors = []
+
+    def worker(seed):
+        try:
+            for i in range(2_000):
+                key = (seed + i) % 16
+                cache.put(key, {"price": i})
+                cache.get(key)
+                cache.get((key + 1) % 16)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(cache) <= 8
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 2_000 * 2
+
+
+def test_batch_cached_prices_misses_together(monkeypatch):
+    from player import Player, PlayerBatch
+
+    batch = PlayerBatch.from_players([Player(**{**PLAYER, "playmaking": pm}) for pm in (4, 6, 8, 10)])
+    cache = pricing_cache.PredictionCache()
+    warm = pricing_cache.predict_price_cached(batch[1], None, cache=cache)
+
+    calls = []
+    real = pricing_cache.pricing.predict_prices
+
+    def spy(players, *args, **kwargs):
+        calls.append(len(players))
+        return real(players, *args, **kwargs)
+
+    monkeypatch.setattr(pricing_cache.pricing, "predict_prices", spy)
+    results = pricing_cache.predict_prices_cached(batch, None, cache=cache)
+    assert calls == [3]
+    assert results[1] == warm
+    assert results == [pricing_cache.pricing.predict_price_from_comparables(p, None) for p in batch]
+    assert pricing_cache.predict_prices_cached(batch, None, cache=cache) == results
+    assert calls == [3]
@@ -1,5 +1,5 @@
 import scheduler
-from datetime import datetime
+from datetime import datetime, timedelta
 from dateutil import tz
 
 
@@ -17,3 +17,49 @@ def test_recommend_expiry_slots(monkeypatch):
 
     assert slots["sat_expiry"] == datetime(2023, 1, 7, 15, 45, tzinfo=tzinfo)
     assert slots["wed_expiry"] == datetime(2023, 1, 4, 15, 45, tzinfo=tzinfo)
+
+
+def test_get_tz_is_cached():
+    assert scheduler.get_tz("America/Santiago") is scheduler.get_tz("America/Santiago")
+
+
+def test_plan_auctions_staggers_across_windows():
+    tzinfo = tz.gettz("America/Santiago")
+    now = datetime(2023, 1, 2, 10, 0, tzinfo=tzinfo)  # Monday
+    listings = [{"name": f"P{i}"} for i in range(7)]
+    plan = scheduler.plan_auctions(listings, per_window=3, stagger_minutes=5, now=now)
+
+    expiries = [item["expiry"].replace(tzinfo=None) for item in plan]
+    assert expiries == [
+        datetime(2023, 1, 4, 15, 45), datetime(2023, 1, 4, 15, 50), datetime(2023, 1, 4, 15, 55),
+        datetime(2023, 1, 7, 15, 45), datetime(2023, 1, 7, 15, 50), datetime(2023, 1, 7, 15, 55),
+        datetime(2023, 1, 11, 15, 45),
+    ]
+    assert [item["name"] for item in plan] == [f"P{i}" for i in range(7)]
+    assert all(item["expiry"] - item["publish"] == timedelta(hours=72) for item in plan)
+
+
+def test_plan_auctions_handles_hundreds_of_listings():
+    now = datetime(2023, 1, 2, 10, 0, tzinfo=tz.gettz("America/Santiago"))
+    plan = scheduler.plan_auctions(({"name": str(i)} for i in range(500)), now=now)
+    assert len(plan) == 500
+    assert len({item["expiry"] for item in plan}) == 500
+
+
+def test_recommend_expiry_slots_with_learned_peaks():
+    from peak_slots import PeakSlotHistogram
+    import pandas as pd
+    from synth_data import generate_sales
+
+    peaks = PeakSlotHistogram()
+    peaks.add(pd.concat(generate_sales(20_000, seed=1), ignore_index=True))
+    now = datetime(2023, 1, 2, 10, 0, tzinfo=tz.gettz("America/Santiago"))
+    slots = scheduler.recommend_expiry_slots(now=now, peaks=peaks, player={"age_days": 9_000, "playmaking": 8}, k=2)
+
+    assert slots["sat_expiry"] == datetime(2023, 1, 7, 15, 45, tzinfo=now.tzinfo)
+    best = slots["top_windows"]
+    assert len(best) == 2
+    assert all(w["expiry"].weekday() == w["weekday"] and w["expiry"] > now for w in best)
+    assert scheduler.peak_windows(peaks, k=1)[0][0] == 5
+    assert scheduler.peak_windows(None) == scheduler.PEAK_WINDOWS
+    assert scheduler.peak_windows(PeakSlotHistogram()) == scheduler.PEAK_WINDOWS
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pricing
+import pricing_model
+import market_store
+import shared_store
+
+
+def test_shared_tree_matches_sklearn(tmp_path):
+    model = pricing_model.load_model()
+    store = shared_store.SharedArrayStore(tmp_path)
+    version = pricing_model.model_version(pricing_model.MODEL_PATH)
+    shared = shared_store.shared_model(store, "pricing_model", version, lambda: model)
+
+    X = pd.read_csv(pricing_model.DATA_PATH)[pricing_model.FEATURES].to_numpy()
+    X = np.vstack([X, X + 0.5])
+    assert np.array_equal(shared.predict(X), model.predict(X))
+    assert isinstance(shared.threshold, np.memmap)
+
+    # A second attach with the same version does not reload the model.
+    def fail():
+        raise AssertionError("model should not be reloaded")
+
+    again = shared_store.shared_model(store, "pricing_model", version, fail)
+    assert np.array_equal(again.predict(X), model.predict(X))
+
+
+def test_share_frame_zero_copy(tmp_path):
+    store = shared_store.SharedArrayStore(tmp_path)
+    df = pd.read_csv(pricing_model.DATA_PATH).assign(name="x")
+    shared = shared_store.share_frame(store, df)
+    arr = shared["price"].to_numpy()
+    while arr is not None and not isinstance(arr, np.memmap):
+        arr = arr.base
+    assert isinstance(arr, np.memmap)
+    pd.testing.assert_frame_equal(shared, df)
+
+
+def test_share_frame_keeps_sale_identity(tmp_path):
+    store = shared_store.SharedArrayStore(tmp_path)
+    df = pd.DataFrame({
+        "player_id": [1, 2, 3],
+        "deadline": ["2024-03-30 15:45", None, "2024-04-13 15:45"],
+        "sold_at": pd.to_datetime(["2024-03-30", "2024-04-06", "2024-04-13"]).tz_localize("UTC"),
+        "tsi": pd.array([5000, None, 7000], dtype="Int64"),
+        "price": [1e6, 2e6, 3e6],
+    })
+    shared = shared_store.share_frame(store, df)
+    pd.testing.assert_frame_equal(shared[["player_id", "deadline", "sold_at", "price"]],
+                                  df[["player_id", "deadline", "sold_at", "price"]])
+    assert shared["tsi"].isna().tolist() == [False, True, False]
+    assert market_store.sale_keys(shared).tolist() == market_store.sale_keys(df).tolist()
+
+
+def test_publish_removes_stale_bundles_and_prune_keeps_recent(tmp_path):
+    store = shared_store.SharedArrayStore(tmp_path)
+    for i in range(3):
+        store.publish("comps-a", {"x": np.arange(i + 1)})
+    assert len([p for p in tmp_path.iterdir() if p.name.startswith("comps-a-")]) == 1
+    assert list(store.attach("comps-a")[0]["x"]) == [0, 1, 2]
+
+    for name in ("comps-b", "comps-c"):
+        store.publish(name, {"x": np.zeros(2)})
+    store.publish("pricing_model", {"x": np.ones(1)})
+    assert store.prune("comps-", keep=2) == ["comps-a"]
+    assert store.attach("comps-a") is None
+    assert store.attach("comps-c") is not None and store.attach("pricing_model") is not None
+    assert not any(p.name.startswith("comps-a") for p in tmp_path.iterdir())
+
+
+def test_pricing_uses_shared_models(tmp_path, monkeypatch):
+    player = {"playmaking": 8, "passing": 5, "defending": 4, "scoring": 3,
+              "winger": 2, "form": 7, "tsi": 5000, "age_days": 8000,
+              "specialty_index": 1}
+    expected = pricing.predict_price_from_comparables(player, None)
+
+    monkeypatch.setenv("HT_SHARED_DIR", str(tmp_path))
+    monkeypatch.setattr(pricing, "_MODEL", None)
+    result = pricing.predict_price_from_comparables(player, None)
+    assert isinstance(pricing._MODEL, shared_store.SharedTreeModel)
+    assert result == expected
@@ -0,0 +1,41 @@
+import io
+
+import pandas as pd
+import pricing
+import pricing_model
+import synth_data
+from ho_import import parse_ho_csv
+
+
+def test_sales_schema_and_determinism(tmp_path):
+    path = tmp_path / "sales.csv"
+    assert synth_data.write_sales_csv(path, 2_500, seed=7, chunk_size=1_000) == 2_500
+    df = pd.read_csv(path)
+    assert len(df) == 2_500
+    assert set(pricing_model.FEATURES_GK + ["price"]) <= set(df.columns)
+    assert df["player_id"].is_unique
+
+    again = pd.concat(synth_data.generate_sales(2_500, seed=7, chunk_size=700), ignore_index=True)
+    assert df["price"].round(2).equals(again["price"].round(2))
+
+    sample = pd.read_csv(pricing_model.DATA_PATH)
+    assert 0.5 < df["price"].median() / sample["price"].median() < 2
+    assert df["playmaking"].between(sample["playmaking"].min(), sample["playmaking"].max()).all()
+
+    model = pricing_model.train_model(path, tmp_path / "model.pkl")
+    assert model.get_depth() > 0
+    player = df.iloc[0].drop(["price", "deadline"]).to_dict()
+    assert pricing.predict_price_from_comparables(player, df)["price_pred"] > 0
+
+
+def test_ho_export_parses_in_both_languages():
+    for spanish, sep in ((False, ","), (True, ";")):
+        buf = io.StringIO()
+        synth_data.write_ho_csv(buf, 300, seed=1, spanish=spanish, sep=sep, gk_share=0.2, chunk_size=128)
+        df = parse_ho_csv(buf.getvalue())
+        assert len(df) == 300
+        assert df["Name"].is_unique
+        assert (df["Goalkeeping"] >= 6).any()
+        assert df["TSI"].gt(0).all()
+        if spanish:
+            assert buf.getvalue().startswith("Nombre;Edad;EdadDías")